@@ -0,0 +1,39 @@
+"""Add composite index for keyset pagination of a user's orders.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+The composite index leads with user_id, so it also serves lookups by
+user_id alone; the single-column ix_orders_user_id is dropped to spare
+every insert its maintenance.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, Sequence[str], None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_orders_user_id_created_at_id",
+        "orders",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_orders_user_id", table_name="orders")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_orders_user_id", "orders", ["user_id"], unique=False
+    )
+    op.drop_index("ix_orders_user_id_created_at_id", table_name="orders")
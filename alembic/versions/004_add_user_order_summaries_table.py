@@ -0,0 +1,51 @@
+"""Add user_order_summaries rollup table.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+Run `python -m app.commands.backfill_order_summaries` after upgrading to
+populate rollups for existing orders.
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, Sequence[str], None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_order_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "pending_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "paid_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "shipped_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "canceled_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "total_spend", sa.Float(), nullable=False, server_default="0"
+        ),
+        sa.Column("last_order_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_order_summaries")
@@ -0,0 +1,53 @@
+"""Add indexes for status and date-range filtering of a user's orders.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, Sequence[str], None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_orders_user_id_status_created_at",
+        "orders",
+        ["user_id", "status", "created_at", "id"],
+        unique=False,
+    )
+    # Partial indexes for the hot PENDING and PAID states (Postgres)
+    op.create_index(
+        "ix_orders_pending_user_id_created_at",
+        "orders",
+        ["user_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "ix_orders_paid_user_id_created_at",
+        "orders",
+        ["user_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PAID'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_paid_user_id_created_at", table_name="orders")
+    op.drop_index(
+        "ix_orders_pending_user_id_created_at", table_name="orders"
+    )
+    op.drop_index(
+        "ix_orders_user_id_status_created_at", table_name="orders"
+    )
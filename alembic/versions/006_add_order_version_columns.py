@@ -0,0 +1,42 @@
+"""Add orders.version and user_order_summaries.orders_version.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, Sequence[str], None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "orders",
+        sa.Column(
+            "version", sa.Integer(), nullable=False, server_default="1"
+        ),
+    )
+    op.add_column(
+        "user_order_summaries",
+        sa.Column(
+            "orders_version",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user_order_summaries", "orders_version")
+    op.drop_column("orders", "version")
@@ -0,0 +1,57 @@
+"""Convert orders.items to JSONB with a GIN index for containment search.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, Sequence[str], None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "orders",
+        "items",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="items::jsonb",
+    )
+    # jsonb_path_ops: smaller and faster than the default opclass, and
+    # sufficient because the index only serves @> containment queries
+    op.create_index(
+        "ix_orders_items_gin",
+        "orders",
+        ["items"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"items": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_orders_items_gin", table_name="orders")
+    op.alter_column(
+        "orders",
+        "items",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="items::json",
+    )
@@ -0,0 +1,196 @@
+"""Partition orders by created_at month (range partitioning).
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+Postgres only. The table is rebuilt as a partitioned table, with one
+partition per month from the oldest order through ORDER_PARTITION_
+MONTHS_AHEAD months ahead, and the rows are copied over. The primary key
+becomes (id, created_at), because a unique constraint on a partitioned
+table must include the partition key. From here on id alone is not
+enforced unique across partitions; uniqueness rests on ids being
+generated by the app as uuid4 (see app/models/order.py), so never insert
+orders with ids from elsewhere. There is no default partition, so
+run `python -m app.commands.manage_order_partitions` regularly (e.g.
+daily from cron) to keep partitions created ahead of time.
+
+"""
+import os
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, Sequence[str], None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    (
+        "ix_orders_user_id_created_at_id",
+        ["user_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_orders_user_id_status_created_at",
+        ["user_id", "status", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_orders_pending_user_id_created_at",
+        ["user_id", "created_at", "id"],
+        "status = 'PENDING'",
+    ),
+    (
+        "ix_orders_paid_user_id_created_at",
+        ["user_id", "created_at", "id"],
+        "status = 'PAID'",
+    ),
+)
+
+
+def _create_orders_table(name: str, **kw) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("items", postgresql.JSONB(), nullable=False),
+        sa.Column("total_price", sa.Float(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="order_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "version", sa.Integer(), nullable=False, server_default="1"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="orders_user_id_fkey",
+            ondelete="CASCADE",
+        ),
+        **kw,
+    )
+
+
+def _create_indexes() -> None:
+    for name, columns, where in _INDEXES:
+        op.create_index(
+            name,
+            "orders",
+            columns,
+            unique=False,
+            postgresql_where=sa.text(where) if where else None,
+        )
+    op.create_index(
+        "ix_orders_items_gin",
+        "orders",
+        ["items"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"items": "jsonb_path_ops"},
+    )
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    op.rename_table("orders", "orders_unpartitioned")
+    # Frees the index and constraint names for the new table
+    op.execute(
+        "ALTER TABLE orders_unpartitioned "
+        "RENAME CONSTRAINT orders_pkey TO orders_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE orders_unpartitioned "
+        "RENAME CONSTRAINT orders_user_id_fkey "
+        "TO orders_unpartitioned_user_id_fkey"
+    )
+    for name, _, _ in _INDEXES:
+        op.drop_index(name, table_name="orders_unpartitioned")
+    op.drop_index("ix_orders_items_gin", table_name="orders_unpartitioned")
+
+    _create_orders_table(
+        "orders", postgresql_partition_by="RANGE (created_at)"
+    )
+    oldest = bind.execute(
+        sa.text(
+            "SELECT min(created_at AT TIME ZONE 'UTC') "
+            "FROM orders_unpartitioned"
+        )
+    ).scalar()
+    now = datetime.now(timezone.utc)
+    first = (oldest or now).date().replace(day=1)
+    ahead = int(os.getenv("ORDER_PARTITION_MONTHS_AHEAD", "3"))
+    last = _add_months(now.date().replace(day=1), ahead)
+    month = first
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE orders_p{month:%Y_%m} PARTITION OF orders "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+            f"TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+        )
+        month = upper
+
+    op.execute(
+        "INSERT INTO orders "
+        "(id, user_id, items, total_price, status, created_at, version) "
+        "SELECT id, user_id, items, total_price, status, created_at, "
+        "version FROM orders_unpartitioned"
+    )
+    op.drop_table("orders_unpartitioned")
+    # Built per partition after the copy, which is faster than
+    # maintaining them row by row
+    op.create_primary_key("orders_pkey", "orders", ["id", "created_at"])
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Partitions detached by manage_order_partitions are not copied back
+    op.rename_table("orders", "orders_partitioned")
+    op.execute(
+        "ALTER TABLE orders_partitioned "
+        "RENAME CONSTRAINT orders_pkey TO orders_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE orders_partitioned "
+        "RENAME CONSTRAINT orders_user_id_fkey "
+        "TO orders_partitioned_user_id_fkey"
+    )
+    for name, _, _ in _INDEXES:
+        op.drop_index(name, table_name="orders_partitioned")
+    op.drop_index("ix_orders_items_gin", table_name="orders_partitioned")
+
+    _create_orders_table("orders")
+    op.execute(
+        "INSERT INTO orders "
+        "(id, user_id, items, total_price, status, created_at, version) "
+        "SELECT id, user_id, items, total_price, status, created_at, "
+        "version FROM orders_partitioned"
+    )
+    op.drop_table("orders_partitioned")
+    op.create_primary_key("orders_pkey", "orders", ["id"])
+    _create_indexes()
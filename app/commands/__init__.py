@@ -0,0 +1 @@
+"""Management commands run with `python -m app.commands.<name>`."""
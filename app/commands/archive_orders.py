@@ -0,0 +1,49 @@
+"""Move old SHIPPED and CANCELED orders to orders_archive.
+
+Usage: python -m app.commands.archive_orders
+       [--older-than-days N] [--batch-size N]
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.order_archive_service import archive_closed_orders
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments and archive closed orders in batches."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+        help=(
+            "Archive orders created more than this many days ago; must not "
+            "be below ORDER_ARCHIVE_AFTER_DAYS of the API (default: "
+            "%(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.ORDER_ARCHIVE_BATCH_SIZE,
+        help="Orders per transaction (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if args.older_than_days < settings.ORDER_ARCHIVE_AFTER_DAYS:
+        parser.error("--older-than-days is below ORDER_ARCHIVE_AFTER_DAYS")
+    logging.basicConfig(level=logging.INFO)
+    before = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+    db = SessionLocal()
+    try:
+        moved = archive_closed_orders(db, before, batch_size=args.batch_size)
+    finally:
+        db.close()
+    logging.info("Archived %d orders created before %s", moved, before)
+
+
+if __name__ == "__main__":
+    main()
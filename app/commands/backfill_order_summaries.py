@@ -0,0 +1,39 @@
+"""Rebuild per-user order summaries from orders and orders_archive.
+
+Migration 004 creates the summary table empty; run this once after
+upgrading past it. It is safe to run while the app is serving writes.
+
+Usage: python -m app.commands.backfill_order_summaries [--batch-size N]
+"""
+
+import argparse
+import logging
+
+from app.core.database import SessionLocal
+from app.services.order_service import cache_list_versions
+from app.services.order_summary_service import rebuild_user_summaries
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments and rebuild all rollups in batches of users."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Users per transaction (default: 500)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        processed = rebuild_user_summaries(db, batch_size=args.batch_size)
+        # Move cached list ETags and pages to the rebuilt versions
+        cache_list_versions(db)
+    finally:
+        db.close()
+    logging.info("Rebuilt order summaries for %d users", processed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Create upcoming monthly orders partitions and detach old ones (Postgres).
+
+Usage: python -m app.commands.manage_order_partitions
+       [--months-ahead N] [--retain-months N] [--dry-run]
+
+Run it regularly (e.g. daily from cron): orders has no default
+partition, so inserting an order for a month without a partition fails.
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.order_partition_service import (
+    add_months,
+    create_order_partitions,
+    current_month,
+    detach_order_partitions,
+    is_orders_partitioned,
+)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse arguments, then create and detach partitions."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.ORDER_PARTITION_MONTHS_AHEAD,
+        help="Future months to have partitions for (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=settings.ORDER_PARTITION_RETAIN_MONTHS,
+        help=(
+            "Detach partitions older than this many months, 0 keeps all "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only log what would be created and detached",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        if not is_orders_partitioned(db):
+            logging.error("orders is not a partitioned Postgres table")
+            sys.exit(1)
+        month = current_month()
+        created = create_order_partitions(
+            db, month, args.months_ahead + 1, dry_run=args.dry_run
+        )
+        detached = []
+        if args.retain_months > 0:
+            detached = detach_order_partitions(
+                db,
+                add_months(month, -args.retain_months),
+                dry_run=args.dry_run,
+            )
+    finally:
+        db.close()
+    logging.info("Created partitions: %s", ", ".join(created) or "none")
+    logging.info("Detached partitions: %s", ", ".join(detached) or "none")
+
+
+if __name__ == "__main__":
+    main()
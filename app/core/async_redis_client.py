@@ -0,0 +1,302 @@
+"""redis.asyncio counterparts of the order cache functions (ASYNC_MODE).
+
+Keys, value encoding, the version-guarded set script and the in-process
+L1 are shared with app.core.redis_client, so sync and async workers can
+read each other's entries.
+"""
+
+import uuid
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.redis_client import (
+    _RELEASE_LOCK_SCRIPT,
+    _SET_ORDER_SCRIPT,
+    _SET_VERSION_SCRIPT,
+    ORDER_INVALIDATION_CHANNEL,
+    _codec,
+    _order_l1,
+    _principal_l1,
+    _principal_redis_counter,
+    finish_order_lookup,
+    l1_has_newer_order,
+    order_cache_key,
+    order_fill_lock_key,
+    order_invalidation_message,
+    order_lookup_fields,
+    order_missing_key,
+    order_set_args,
+    principal_cache_key,
+    read_your_writes_enabled,
+    recent_write_key,
+    user_orders_page_key,
+    user_orders_version_key,
+)
+
+_redis_client: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return the asyncio Redis client. Creates one if not yet created."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the asyncio client's connection pool (on shutdown)."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+async def cache_order_lookup(
+    order_id: str, with_items: bool = True
+) -> tuple[dict[str, Any] | None, float | None, float]:
+    """See redis_client.cache_order_lookup."""
+    local = _order_l1.get(order_id)
+    if local is not None and (not with_items or "items" in local):
+        return local, None, 0.0
+    try:
+        key = order_cache_key(order_id)
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(key, order_lookup_fields(with_items))
+        pipe.pttl(key)
+        values, pttl = await pipe.execute()
+        return finish_order_lookup(order_id, values, pttl, with_items)
+    except Exception:
+        return None, None, 0.0
+
+
+async def cache_order_get(
+    order_id: str, with_items: bool = True
+) -> dict[str, Any] | None:
+    """See redis_client.cache_order_get."""
+    return (await cache_order_lookup(order_id, with_items))[0]
+
+
+async def cache_order_set(
+    order_id: str,
+    order_data: dict[str, Any],
+    compute_time: float | None = None,
+) -> None:
+    """See redis_client.cache_order_set."""
+    if l1_has_newer_order(order_id, order_data):
+        return
+    try:
+        script = get_redis().register_script(_SET_ORDER_SCRIPT)
+        accepted = await script(
+            keys=[order_cache_key(order_id)],
+            args=order_set_args(order_data, compute_time),
+        )
+        if accepted == 0:
+            return
+    except Exception:
+        pass
+    _order_l1.set(order_id, order_data)
+
+
+async def cache_order_write_through(
+    order_id: str, order_data: dict[str, Any]
+) -> None:
+    """See redis_client.cache_order_write_through."""
+    await cache_order_set(order_id, order_data)
+    try:
+        await get_redis().publish(
+            ORDER_INVALIDATION_CHANNEL, order_invalidation_message(order_id)
+        )
+    except Exception:
+        pass
+
+
+async def cache_order_delete(order_id: str) -> None:
+    """See redis_client.cache_order_delete."""
+    _order_l1.delete(order_id)
+    try:
+        client = get_redis()
+        await client.delete(order_cache_key(order_id))
+        await client.publish(
+            ORDER_INVALIDATION_CHANNEL, order_invalidation_message(order_id)
+        )
+    except Exception:
+        pass
+
+
+async def cache_order_is_missing(order_id: str) -> bool:
+    """See redis_client.cache_order_is_missing."""
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return False
+    try:
+        return bool(await get_redis().exists(order_missing_key(order_id)))
+    except Exception:
+        return False
+
+
+async def cache_order_set_missing(order_id: str) -> None:
+    """See redis_client.cache_order_set_missing."""
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return
+    try:
+        await get_redis().set(
+            order_missing_key(order_id),
+            b"1",
+            ex=settings.ORDER_NEGATIVE_CACHE_TTL,
+        )
+    except Exception:
+        pass
+
+
+async def cache_order_clear_missing(order_id: str) -> None:
+    """See redis_client.cache_order_clear_missing."""
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return
+    try:
+        await get_redis().delete(order_missing_key(order_id))
+    except Exception:
+        pass
+
+
+async def cache_user_orders_version_get(user_id: int) -> int | None:
+    """See redis_client.cache_user_orders_version_get."""
+    try:
+        version = await get_redis().get(user_orders_version_key(user_id))
+    except Exception:
+        return None
+    return int(version) if version is not None else None
+
+
+async def cache_user_orders_version_set(user_id: int, version: int) -> None:
+    """See redis_client.cache_user_orders_version_set."""
+    try:
+        await get_redis().eval(
+            _SET_VERSION_SCRIPT,
+            1,
+            user_orders_version_key(user_id),
+            version,
+            settings.ORDER_LIST_CACHE_TTL,
+        )
+    except Exception:
+        pass
+
+
+async def cache_user_orders_get(
+    user_id: int, version: int, digest: str
+) -> dict[str, Any] | None:
+    """See redis_client.cache_user_orders_get."""
+    try:
+        data = await get_redis().get(
+            user_orders_page_key(user_id, version, digest)
+        )
+    except Exception:
+        return None
+    return _codec.decode(data) if data is not None else None
+
+
+async def cache_user_orders_set(
+    user_id: int, version: int, digest: str, page: dict[str, Any]
+) -> None:
+    """See redis_client.cache_user_orders_set."""
+    try:
+        await get_redis().setex(
+            user_orders_page_key(user_id, version, digest),
+            settings.ORDER_LIST_CACHE_TTL,
+            _codec.encode(page),
+        )
+    except Exception:
+        pass
+
+
+async def acquire_order_fill_lock(order_id: str) -> str | None:
+    """See redis_client.acquire_order_fill_lock."""
+    token = uuid.uuid4().hex
+    try:
+        acquired = await get_redis().set(
+            order_fill_lock_key(order_id),
+            token,
+            nx=True,
+            px=int(settings.ORDER_FILL_LOCK_TTL * 1000),
+        )
+    except Exception:
+        return ""
+    return token if acquired else None
+
+
+async def cache_order_poll_fill(
+    order_id: str, with_items: bool
+) -> tuple[dict[str, Any] | None, bool, bool]:
+    """See redis_client.cache_order_poll_fill."""
+    local = _order_l1.get(order_id)
+    if local is not None and (not with_items or "items" in local):
+        return local, False, True
+    try:
+        key = order_cache_key(order_id)
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(key, order_lookup_fields(with_items))
+        pipe.pttl(key)
+        pipe.exists(order_missing_key(order_id))
+        pipe.exists(order_fill_lock_key(order_id))
+        values, pttl, missing, locked = await pipe.execute()
+        order = finish_order_lookup(order_id, values, pttl, with_items)[0]
+        return order, bool(missing), bool(locked)
+    except Exception:
+        return None, False, False
+
+
+async def release_order_fill_lock(order_id: str, token: str) -> None:
+    """See redis_client.release_order_fill_lock."""
+    if not token:
+        return
+    try:
+        script = get_redis().register_script(_RELEASE_LOCK_SCRIPT)
+        await script(keys=[order_fill_lock_key(order_id)], args=[token])
+    except Exception:
+        pass
+
+
+async def mark_recent_write(user_id: int) -> None:
+    """See redis_client.mark_recent_write."""
+    if not read_your_writes_enabled():
+        return
+    try:
+        await get_redis().set(
+            recent_write_key(user_id),
+            b"1",
+            ex=settings.READ_YOUR_WRITES_SECONDS,
+        )
+    except Exception:
+        pass
+
+
+async def cache_principal_get(user_id: int) -> dict[str, Any] | None:
+    """See redis_client.cache_principal_get."""
+    data = _principal_l1.get(user_id)
+    if data is not None:
+        return data
+    try:
+        raw = await get_redis().get(principal_cache_key(user_id))
+    except Exception:
+        return None
+    if raw is None:
+        _principal_redis_counter.miss()
+        return None
+    _principal_redis_counter.hit()
+    data = _codec.decode(raw)
+    _principal_l1.set(user_id, data)
+    return data
+
+
+async def cache_principal_set(data: dict[str, Any]) -> None:
+    """See redis_client.cache_principal_set."""
+    _principal_l1.set(data["id"], data)
+    try:
+        await get_redis().setex(
+            principal_cache_key(data["id"]),
+            settings.PRINCIPAL_CACHE_TTL,
+            _codec.encode(data),
+        )
+    except Exception:
+        pass
@@ -0,0 +1,48 @@
+"""Byte encoding of cached values: JSON with optional zlib compression.
+
+Every encoded value starts with a one-byte format header. Values written
+before the header existed are plain JSON text, which never starts with
+a header byte, so old and new entries can be read side by side while a
+rollout is in progress.
+"""
+
+import json
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+# Format headers. JSON text never starts with a control byte.
+FORMAT_JSON = b"\x01"
+FORMAT_JSON_ZLIB = b"\x02"
+
+_DECODERS: dict[bytes, Callable[[bytes], bytes]] = {
+    FORMAT_JSON: bytes,
+    FORMAT_JSON_ZLIB: zlib.decompress,
+}
+
+
+class CacheCodec:
+    """
+    Encode values as compact JSON bytes, zlib-compressed once the JSON is
+    at least compress_min_bytes long (0 disables compression).
+    """
+
+    def __init__(self, compress_min_bytes: int = 1024, level: int = 6):
+        self.compress_min_bytes = compress_min_bytes
+        self.level = level
+
+    def encode(self, value: Any) -> bytes:
+        """Return the header byte followed by the (compressed) JSON."""
+        raw = json.dumps(
+            value, default=str, separators=(",", ":"), ensure_ascii=False
+        ).encode()
+        if 0 < self.compress_min_bytes <= len(raw):
+            return FORMAT_JSON_ZLIB + zlib.compress(raw, self.level)
+        return FORMAT_JSON + raw
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a value written by encode or as legacy JSON text."""
+        decoder = _DECODERS.get(data[:1])
+        if decoder is None:
+            return json.loads(data)
+        return json.loads(decoder(data[1:]))
@@ -1,16 +1,180 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import Pool
 
 from app.core.config import settings
+from app.core.pool_metrics import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    instrument_pool,
+)
+from app.core.query_metrics import instrument_queries
+
+logger = logging.getLogger(__name__)
+
+
+def pool_options(url: str, poolclass: type[Pool]) -> dict[str, Any]:
+    """
+    Return create_engine pool keyword arguments from settings. SQLite
+    keeps its default pool, which does not take sizing options.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Create database engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_logging_name="primary",
+    **pool_options(settings.DATABASE_URL, TimedQueuePool),
+)
+instrument_pool(engine, "primary")
+instrument_queries(engine)
 
 # Create session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+class ReplicaSet:
+    """
+    Read replica engines picked round-robin. A replica whose connection
+    fails (on connect, or dropped mid-query) is skipped for retry_after
+    seconds; failures are seen on the real queries, so picking costs no
+    extra round trip.
+    """
+
+    def __init__(self, engines: list[Engine], retry_after: float) -> None:
+        self.engines = engines
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = [0.0] * len(engines)
+        for index, replica in enumerate(engines):
+            event.listen(replica, "handle_error", self._on_error(index))
+
+    def _on_error(self, index: int):
+        """Return a handle_error listener marking replica index down."""
+
+        def handle_error(context: ExceptionContext) -> None:
+            # Failed pre-pings are retried on a fresh connection by the pool
+            if context.is_pre_ping:
+                return
+            if context.connection is None or context.is_disconnect:
+                self.mark_down(index)
+
+        return handle_error
+
+    def mark_down(self, index: int) -> None:
+        """Skip replica index for retry_after seconds."""
+        logger.warning("Read replica %d unavailable", index)
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_after
+
+    def pick(self) -> Engine | None:
+        """Return the next replica not marked down, or None if none is."""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.engines), 1)
+            down_until = list(self._down_until)
+        now = time.monotonic()
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if down_until[index] <= now:
+                return self.engines[index]
+        return None
+
+
+class ReadSession(Session):
+    """
+    Session for read-only queries: bound on first use to a replica, or
+    to the primary if pinned (read-your-writes) or no replica is up. If
+    the replica fails to connect, the session moves to the primary; no
+    statement has run yet, so the query is simply sent there instead.
+    """
+
+    def __init__(self, replicas: ReplicaSet, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.replicas = replicas
+        self.pinned = False
+        self._read_bind: Engine | None = None
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Engine:
+        """Return the engine chosen for this session's first query."""
+        if self._read_bind is None:
+            replica = None if self.pinned else self.replicas.pick()
+            self._read_bind = replica or engine
+        return self._read_bind
+
+    def _connection_for_bind(
+        self, bind: Engine, execution_options: Any = None, **kw: Any
+    ) -> Connection:
+        """Connect to bind, falling back to the primary if a replica fails."""
+        try:
+            return super()._connection_for_bind(bind, execution_options, **kw)
+        except OperationalError:
+            # The replica's handle_error listener already marked it down
+            if bind is engine or bind is not self._read_bind:
+                raise
+            logger.warning("Read replica connect failed; using the primary")
+            self._read_bind = engine
+            return super()._connection_for_bind(
+                engine, execution_options, **kw
+            )
+
+
+def pin_to_primary(db: Session) -> None:
+    """Make a read session use the primary (call before its first query)."""
+    if isinstance(db, ReadSession):
+        db.pinned = True
+
+
+replicas = ReplicaSet(
+    [
+        create_engine(
+            url,
+            pool_logging_name=f"replica{i}",
+            **pool_options(url, TimedQueuePool),
+        )
+        for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+    ],
+    settings.DB_REPLICA_RETRY_SECONDS,
+)
+for i, replica in enumerate(replicas.engines):
+    instrument_pool(replica, f"replica{i}")
+    instrument_queries(replica)
+
+# Async engine and session maker (ASYNC_MODE), created on first use so
+# the sync path never needs an async driver installed
+_async_engine: AsyncEngine | None = None
+_async_session_local: async_sessionmaker[AsyncSession] | None = None
+
+# Async driver used for each sync dialect of DATABASE_URL
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 # Create base class for models
 Base = declarative_base()
 
@@ -26,3 +190,70 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Iterator[Session]:
+    """Dependency function to get a session for read-only queries.
+
+    Uses a read replica when DATABASE_REPLICA_URLS is set, falling back
+    to the primary; without replicas this is the same as get_db.
+
+    Yields:
+        Session: SQLAlchemy database session.
+    """
+    if replicas.engines:
+        db = ReadSession(replicas, autoflush=False)
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Return url with its driver replaced by the dialect's async driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for {parsed.drivername}")
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the async engine for DATABASE_URL. Creates it on first use."""
+    global _async_engine, _async_session_local
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_logging_name="async",
+            **pool_options(settings.DATABASE_URL, TimedAsyncAdaptedQueuePool),
+        )
+        instrument_pool(_async_engine.sync_engine, "async")
+        instrument_queries(_async_engine.sync_engine)
+        _async_session_local = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pool (on shutdown) if it was created."""
+    global _async_engine, _async_session_local
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_local = None
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency function to get an async database session.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session.
+    """
+    get_async_engine()
+    async with _async_session_local() as db:
+        yield db
@@ -0,0 +1,33 @@
+"""Strong ETag helpers for conditional GET (If-None-Match)."""
+
+import hashlib
+from collections.abc import Iterable
+
+
+def make_etag(*parts: object) -> str:
+    """Build a quoted strong ETag from the given parts."""
+    return '"' + ".".join(str(p) for p in parts) + '"'
+
+
+def short_digest(values: Iterable[str]) -> str:
+    """Return a short stable digest of values (order-insensitive)."""
+    joined = "\x00".join(sorted(values))
+    return hashlib.sha256(joined.encode()).hexdigest()[:12]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Return True if an If-None-Match header value matches etag.
+    Handles "*", comma-separated lists and weak (W/) validators.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -19,18 +19,30 @@ def publish_new_order(order_id: str, user_id: int) -> None:
     Payload: {"order_id": "<str>", "user_id": <int>}.
     No-op on connection/publish errors (caller can log).
     """
+    publish_new_orders([(order_id, user_id)])
+
+
+def publish_new_orders(events: list[tuple[str, int]]) -> None:
+    """
+    Publish one new_order event per (order_id, user_id) over a single
+    connection and channel. No-op on connection/publish errors.
+    """
+    if not events:
+        return
     try:
         params = pika.URLParameters(settings.RABBITMQ_URL)
         connection = pika.BlockingConnection(params)
         channel = connection.channel()
         channel.queue_declare(queue=NEW_ORDER_QUEUE, durable=True)
-        body = json.dumps({"order_id": order_id, "user_id": user_id})
-        channel.basic_publish(
-            exchange="",
-            routing_key=NEW_ORDER_QUEUE,
-            body=body,
-            properties=pika.BasicProperties(delivery_mode=2),
-        )
+        properties = pika.BasicProperties(delivery_mode=2)
+        for order_id, user_id in events:
+            body = json.dumps({"order_id": order_id, "user_id": user_id})
+            channel.basic_publish(
+                exchange="",
+                routing_key=NEW_ORDER_QUEUE,
+                body=body,
+                properties=properties,
+            )
         connection.close()
     except Exception:
         pass
@@ -0,0 +1,105 @@
+"""In-process caching primitives: hit/miss counters and a bounded TTL LRU."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class HitCounter:
+    """Thread-safe hit/miss counter for one cache tier."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        """Record a cache hit."""
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        """Record a cache miss."""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return {"hits": ..., "misses": ...}."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache holding at most maxsize entries, each expiring
+    ttl seconds after it was set. maxsize <= 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.counter = HitCounter()
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the cache stores anything at all."""
+        return self.maxsize > 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the live value for key or None (counted as a miss)."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._data[key]
+                value = None
+        if value is None:
+            self.counter.miss()
+        else:
+            self.counter.hit()
+        return value
+
+    def peek(self, key: Hashable) -> Any | None:
+        """Return the live value for key without touching LRU or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        if not self.enabled:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            size = len(self._data)
+        return {**self.counter.stats(), "size": size}
@@ -0,0 +1,32 @@
+"""Opaque keyset cursors for paginated listings."""
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, order_id: str) -> str:
+    """
+    Encode the (created_at, id) position of the last row on a page
+    as an opaque URL-safe string.
+    """
+    raw = json.dumps([created_at.isoformat(), order_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raise ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_str, order_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        created_at = datetime.fromisoformat(created_str)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(order_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, order_id
@@ -0,0 +1,144 @@
+"""Argon2 password hashing in a bounded pool of worker processes.
+
+Each hash costs tens of milliseconds of CPU. Run inline, login storms
+occupy the request threadpool and starve the order endpoints of the
+same worker, so hashes run in a small ProcessPoolExecutor instead. The
+number of hashes running or waiting is capped; past the cap callers get
+PasswordHashPoolSaturated immediately instead of queueing without bound.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from app.core.config import settings
+
+# Hashes are created with these costs; existing hashes keep verifying
+# with the costs encoded in them
+_password_hash = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        ),
+    )
+)
+
+
+def hash_password_now(password: str) -> str:
+    """Hash a password with argon2 in the calling process."""
+    return _password_hash.hash(password)
+
+
+def verify_password_now(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against an argon2 hash in the calling process."""
+    return _password_hash.verify(plain_password, hashed_password)
+
+
+class PasswordHashPoolSaturated(Exception):
+    """The pool already has its maximum number of hashes in flight."""
+
+
+class PasswordHashPool:
+    """
+    Runs functions in `workers` processes with at most `queue_depth`
+    calls waiting for a free process; further calls raise
+    PasswordHashPoolSaturated. workers <= 0 runs calls inline.
+
+    Processes are spawned rather than forked (the app has background
+    threads), on first use or start(), and live until shutdown().
+    """
+
+    def __init__(self, workers: int, queue_depth: int) -> None:
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(
+            max(workers, 0) + max(queue_depth, 0)
+        )
+
+    @property
+    def inline(self) -> bool:
+        """Return True if calls run in the caller instead of the pool."""
+        return self.workers <= 0
+
+    def start(self) -> None:
+        """Create the worker processes now rather than on the first call."""
+        if self.inline:
+            return
+        executor = self._executor_or_create()
+        # Processes are spawned on demand; one job per process starts all
+        for future in [executor.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, waiting for running calls."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Schedule fn(*args) in the pool and return its future, or raise
+        PasswordHashPoolSaturated if no slot is free. fn must be a
+        module-level function (it is pickled by reference). A pool left
+        broken by a dead worker process is replaced once.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashPoolSaturated()
+        try:
+            executor = self._executor_or_create()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                future = self._executor_or_create().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in the pool and wait for its result."""
+        if self.inline:
+            return fn(*args)
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Like run, awaiting the result instead of blocking a thread."""
+        if self.inline:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _executor_or_create(self) -> ProcessPoolExecutor:
+        """Return the executor, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next call creates a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+
+password_pool = PasswordHashPool(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_DEPTH
+)
@@ -0,0 +1,175 @@
+"""DB connection pool metrics: checkout wait, usage peaks, lifetimes.
+
+Engines built by app.core.database use the Timed* pool classes below,
+which time every checkout, and instrument_pool attaches event listeners
+that track usage and connection lifetimes. Stats are kept per pool
+logging name ("primary", "async", ...).
+"""
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class _Timing:
+    """Count, total and maximum of a series of durations (seconds)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add one duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def stats(self) -> dict[str, float]:
+        """Return count, average and maximum (milliseconds)."""
+        avg = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PoolMetrics:
+    """Thread-safe counters for one connection pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.pool: Pool | None = None
+        self.timeouts = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.wait = _Timing()
+        self.held = _Timing()
+        self.lifetime = _Timing()
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        """Record how long a checkout waited for a connection."""
+        with self._lock:
+            self.wait.add(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self, in_use: int, overflow: int) -> None:
+        """Record pool usage right after a checkout."""
+        with self._lock:
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_checkin(self, held: float) -> None:
+        """Record how long a connection was checked out."""
+        with self._lock:
+            self.held.add(held)
+
+    def record_close(self, lifetime: float) -> None:
+        """Record the lifetime of a closed DBAPI connection."""
+        with self._lock:
+            self.lifetime.add(lifetime)
+
+    def stats(self) -> dict[str, Any]:
+        """Return current pool state plus the recorded counters."""
+        current: dict[str, Any] = {}
+        if isinstance(self.pool, QueuePool):
+            current = {
+                "size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "in_use": self.pool.checkedout(),
+                "overflow": max(self.pool.overflow(), 0),
+            }
+        with self._lock:
+            return {
+                **current,
+                "peak_in_use": self.peak_in_use,
+                "peak_overflow": self.peak_overflow,
+                "timeouts": self.timeouts,
+                "checkout_wait": self.wait.stats(),
+                "checkout_held": self.held.stats(),
+                "connection_lifetime": self.lifetime.stats(),
+            }
+
+
+_metrics: dict[str, PoolMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def pool_metrics(name: str) -> PoolMetrics:
+    """Return the metrics of the pool with this logging name."""
+    with _metrics_lock:
+        return _metrics.setdefault(name, PoolMetrics())
+
+
+def all_pool_stats() -> dict[str, dict[str, Any]]:
+    """Return stats of every instrumented pool by name."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    return {name: m.stats() for name, m in metrics.items()}
+
+
+class _TimedPoolMixin:
+    """Time Pool.connect(), i.e. the wait for a free connection."""
+
+    def connect(self):
+        """Check out a connection, recording the wait."""
+        metrics = pool_metrics(self.logging_name or "default")
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except PoolTimeoutError:
+            metrics.record_wait(time.perf_counter() - started, True)
+            raise
+        metrics.record_wait(time.perf_counter() - started, False)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool reporting checkout wait time to pool_metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool reporting checkout wait time to pool_metrics."""
+
+
+def instrument_pool(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach listeners recording usage peaks, checkout hold time and
+    connection lifetime to the engine's pool. Listeners carry over when
+    the pool is recreated (e.g. on dispose).
+    """
+    metrics = pool_metrics(name)
+    metrics.pool = engine.pool
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        record.info["checked_out_at"] = time.monotonic()
+        pool = engine.pool
+        metrics.pool = pool
+        if isinstance(pool, QueuePool):
+            metrics.record_checkout(pool.checkedout(), max(pool.overflow(), 0))
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.record_checkin(time.monotonic() - started)
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_conn, record):
+        connected = record.info.pop("connected_at", None)
+        if connected is not None:
+            metrics.record_close(time.monotonic() - connected)
+
+    return metrics
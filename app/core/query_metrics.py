@@ -0,0 +1,179 @@
+"""Per-request SQL metrics: query count, DB time and slowest statement.
+
+instrument_queries hooks an engine's cursor execution. While a request
+is served by QueryMetricsMiddleware, every statement on an instrumented
+engine is timed into that request's RequestQueries (found through a
+context variable, which also reaches threadpool handlers and the async
+engine's greenlets). The middleware reports the totals in a
+Server-Timing header, logs requests over the SQL_SLOW_REQUEST_*
+thresholds and, with SQL_DETECT_N_PLUS_ONE, statements repeated within
+one request.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueries:
+    """SQL statements executed while serving one request."""
+
+    def __init__(self, track_statements: bool = False) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: str | None = None
+        # Executions per statement text, only for N+1 detection
+        self.statements: Counter[str] | None = (
+            Counter() if track_statements else None
+        )
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Add one executed statement."""
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds >= self.slowest:
+                self.slowest = seconds
+                self.slowest_statement = statement
+            if self.statements is not None:
+                self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Return (statement, executions) run at least threshold times."""
+        if self.statements is None:
+            return []
+        with self._lock:
+            return [
+                (statement, n)
+                for statement, n in self.statements.most_common()
+                if n >= threshold
+            ]
+
+    def server_timing(self) -> str:
+        """Return the Server-Timing header value for these statements."""
+        return (
+            f'db;dur={self.total * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.1f}"
+        )
+
+
+_current: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def collect_queries(
+    track_statements: bool = False,
+) -> Iterator[RequestQueries]:
+    """Record statements on instrumented engines until the block exits."""
+    queries = RequestQueries(track_statements)
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    queries = _current.get()
+    started = getattr(context, "_query_started", None)
+    if queries is not None and started is not None:
+        queries.record(statement, time.perf_counter() - started)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Time the engine's statements into the current RequestQueries."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _one_line(statement: str | None, limit: int = 500) -> str:
+    """Collapse a statement to one line of at most limit characters."""
+    text = " ".join((statement or "").split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def report_request_queries(
+    method: str, path: str, queries: RequestQueries
+) -> None:
+    """Log a request over the slow thresholds and any N+1 suspects."""
+    total_ms = queries.total * 1000
+    if (
+        queries.count >= settings.SQL_SLOW_REQUEST_QUERIES
+        or total_ms >= settings.SQL_SLOW_REQUEST_MS
+    ):
+        logger.warning(
+            "Slow request %s %s: %d queries, %.1f ms in DB; "
+            "slowest %.1f ms: %s",
+            method,
+            path,
+            queries.count,
+            total_ms,
+            queries.slowest * 1000,
+            _one_line(queries.slowest_statement),
+        )
+    for statement, n in queries.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            "Possible N+1 in %s %s: %d executions of %s",
+            method,
+            path,
+            n,
+            _one_line(statement),
+        )
+
+
+class QueryMetricsMiddleware:
+    """
+    ASGI middleware collecting the SQL statements of each HTTP request,
+    sent back as a Server-Timing header and logged past thresholds.
+    Statements run after the response has started (streamed bodies) are
+    logged but not in the header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.SQL_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries(settings.SQL_DETECT_N_PLUS_ONE) as queries:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", queries.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                report_request_queries(scope["method"], scope["path"], queries)
@@ -1,23 +1,100 @@
 """Redis client for order cache (get/set/delete with TTL)."""
 
-import json
+import logging
+import os
+import threading
+import uuid
 from typing import Any
 
 import redis
 
+from app.core.cache_codec import CacheCodec
 from app.core.config import settings
+from app.core.local_cache import HitCounter, TTLCache
+
+logger = logging.getLogger(__name__)
 
 _redis_client: redis.Redis | None = None
 
+# Per-worker L1 in front of Redis, plus hit/miss counters for both tiers.
+_order_l1 = TTLCache(settings.ORDER_L1_CACHE_SIZE, settings.ORDER_L1_CACHE_TTL)
+_order_redis_counter = HitCounter()
+
+# Authenticated principals ({"id", "email"} by user id), same two tiers
+_principal_l1 = TTLCache(
+    settings.PRINCIPAL_L1_CACHE_SIZE, settings.PRINCIPAL_L1_CACHE_TTL
+)
+_principal_redis_counter = HitCounter()
+
+# Encoding of cached order and list page values (see cache_codec)
+_codec = CacheCodec(
+    settings.CACHE_COMPRESS_MIN_BYTES, settings.CACHE_COMPRESS_LEVEL
+)
+
+# Pub/sub channel carrying "<worker id>:<order id>" for order cache
+# entries invalidated by that worker (see order_invalidation_message).
+ORDER_INVALIDATION_CHANNEL = "order-cache-invalidate"
+# Pub/sub channel carrying ids of deleted users, for their principals.
+PRINCIPAL_INVALIDATION_CHANNEL = "principal-cache-invalidate"
+_PRINCIPAL_CHANNEL = PRINCIPAL_INVALIDATION_CHANNEL.encode()
+
+# Each cached order is a Redis hash: "head" holds the scalar fields and
+# "items" holds the (potentially large) items array, both encoded
+# by _codec, so reads
+# that do not need items never transfer or decode them.
+ORDER_HEAD_FIELD = "head"
+ORDER_ITEMS_FIELD = "items"
+# Seconds the DB load took when the entry was filled (for early refresh)
+ORDER_DELTA_FIELD = "delta"
+# Plain integer copy of the order version, compared by _SET_ORDER_SCRIPT
+ORDER_VERSION_FIELD = "version"
+
+# Writes an order hash unless the cached version is newer, so a slow
+# reader holding an old row cannot overwrite a fresher entry. A strictly
+# older entry is dropped first so none of its fields survive.
+# KEYS[1] = order key; ARGV = version, ttl, field, value, ...
+_SET_ORDER_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version'))
+local version = tonumber(ARGV[1])
+if current and current > version then
+    return 0
+end
+if current and current < version then
+    redis.call('DEL', KEYS[1])
+end
+redis.call('HSET', KEYS[1], 'version', ARGV[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Sets a user's cached orders_version unless the cached one is newer.
+# KEYS[1] = version key; ARGV = version, ttl
+_SET_VERSION_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if current and current >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# Deletes a lock only if it still holds the caller's token.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 
 def get_redis() -> redis.Redis:
-    """Return a Redis client (sync). Creates one if not yet created."""
+    """
+    Return a Redis client (sync). Creates one if not yet created.
+    Replies are raw bytes; cached values are decoded with _codec.
+    """
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,
-        )
+        _redis_client = redis.from_url(settings.REDIS_URL)
     return _redis_client
 
 
@@ -26,33 +103,264 @@ def order_cache_key(order_id: str) -> str:
     return f"order:{order_id}"
 
 
-def cache_order_get(order_id: str) -> dict[str, Any] | None:
+def cache_order_get(
+    order_id: str, with_items: bool = True
+) -> dict[str, Any] | None:
     """
-    Get order from cache by id. Returns None on miss or error.
+    Get order from cache by id: in-process L1 first, then Redis (which
+    refills L1). Returns None on miss or error.
+    With with_items=False only the scalar fields are fetched.
     """
+    return cache_order_lookup(order_id, with_items)[0]
+
+
+def cache_order_lookup(
+    order_id: str, with_items: bool = True
+) -> tuple[dict[str, Any] | None, float | None, float]:
+    """
+    Like cache_order_get, but return (order, ttl, delta): the remaining
+    Redis TTL in seconds (None for L1 hits, misses and errors) and the DB
+    load time recorded when the entry was filled (0 if unknown).
+    Redis is read in one pipelined round trip.
+    """
+    local = _order_l1.get(order_id)
+    if local is not None and (not with_items or "items" in local):
+        return local, None, 0.0
     try:
-        client = get_redis()
         key = order_cache_key(order_id)
-        data = client.get(key)
-        if data is None:
-            return None
-        return json.loads(data)
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(key, order_lookup_fields(with_items))
+        pipe.pttl(key)
+        values, pttl = pipe.execute()
+        return finish_order_lookup(order_id, values, pttl, with_items)
     except Exception:
-        return None
+        return None, None, 0.0
+
+
+def order_lookup_fields(with_items: bool) -> list[str]:
+    """Return the hash fields read by an order lookup."""
+    fields = [ORDER_HEAD_FIELD, ORDER_DELTA_FIELD]
+    if with_items:
+        fields.append(ORDER_ITEMS_FIELD)
+    return fields
+
+
+def finish_order_lookup(
+    order_id: str, values: list[Any], pttl: int | None, with_items: bool
+) -> tuple[dict[str, Any] | None, float | None, float]:
+    """
+    Decode the HMGET values and PTTL of an order lookup, count the hit or
+    miss and refill L1. Shared by the sync and asyncio clients.
+    """
+    head, delta = values[0], values[1]
+    items = values[2] if with_items else None
+    if head is None or (with_items and items is None):
+        _order_redis_counter.miss()
+        return None, None, 0.0
+    data = _codec.decode(head)
+    if with_items:
+        data["items"] = _codec.decode(items)
+    _order_redis_counter.hit()
+    _order_l1.set(order_id, data)
+    ttl = pttl / 1000 if pttl and pttl > 0 else None
+    return data, ttl, float(delta) if delta else 0.0
 
 
-def cache_order_set(order_id: str, order_data: dict[str, Any]) -> None:
+def cache_order_get_many(order_ids: list[str]) -> dict[str, dict[str, Any]]:
     """
-    Set order in cache with TTL (5 minutes). No-op on error.
+    Get many full orders (with items) from cache: L1 first, then one
+    pipelined round trip of HMGETs to Redis for the rest. Return a dict of
+    the orders found by id; misses and errors are simply absent.
     """
+    found: dict[str, dict[str, Any]] = {}
+    remote: list[str] = []
+    for order_id in order_ids:
+        local = _order_l1.get(order_id)
+        if local is not None and "items" in local:
+            found[order_id] = local
+        else:
+            remote.append(order_id)
+    if not remote:
+        return found
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for order_id in remote:
+            pipe.hmget(
+                order_cache_key(order_id),
+                [ORDER_HEAD_FIELD, ORDER_ITEMS_FIELD],
+            )
+        results = pipe.execute()
+    except Exception:
+        return found
+    for order_id, (head, items) in zip(remote, results):
+        if head is None or items is None:
+            _order_redis_counter.miss()
+            continue
+        _order_redis_counter.hit()
+        data = _codec.decode(head)
+        data["items"] = _codec.decode(items)
+        _order_l1.set(order_id, data)
+        found[order_id] = data
+    return found
+
+
+def cache_order_set(
+    order_id: str,
+    order_data: dict[str, Any],
+    compute_time: float | None = None,
+) -> None:
+    """
+    Set order in L1 and in Redis with TTL (5 minutes). No-op on error.
+    If order_data has no "items" key only the scalar fields are stored.
+    compute_time (seconds spent loading from the DB) is kept for
+    probabilistic early refresh. The write is skipped if the cache
+    already holds a newer version of the order.
+    """
+    if l1_has_newer_order(order_id, order_data):
+        return
+    try:
+        script = get_redis().register_script(_SET_ORDER_SCRIPT)
+        accepted = script(
+            keys=[order_cache_key(order_id)],
+            args=order_set_args(order_data, compute_time),
+        )
+        if accepted == 0:
+            return
+    except Exception:
+        pass
+    _order_l1.set(order_id, order_data)
+
+
+def l1_has_newer_order(order_id: str, order_data: dict[str, Any]) -> bool:
+    """Return True if L1 already holds a newer version of the order."""
+    local = _order_l1.peek(order_id)
+    return local is not None and int(local.get("version", 0)) > int(
+        order_data.get("version", 0)
+    )
+
+
+def order_set_args(
+    order_data: dict[str, Any], compute_time: float | None = None
+) -> list[Any]:
+    """
+    Return ARGV for _SET_ORDER_SCRIPT: version, TTL, then the encoded
+    head, items (if present) and compute time (if given).
+    """
+    head = dict(order_data)
+    items = head.pop("items", None)
+    args = [
+        int(order_data.get("version", 0)),
+        getattr(settings, "CACHE_TTL", 300),
+        ORDER_HEAD_FIELD,
+        _codec.encode(head),
+    ]
+    if items is not None:
+        args += [ORDER_ITEMS_FIELD, _codec.encode(items)]
+    if compute_time is not None:
+        args += [ORDER_DELTA_FIELD, f"{compute_time:.6f}"]
+    return args
+
+
+def cache_order_set_many(orders: list[dict[str, Any]]) -> None:
+    """
+    Cache many orders in one pipelined round trip, each write guarded by
+    version like cache_order_set. No-op on error.
+    """
+    if not orders:
+        return
     try:
         client = get_redis()
-        key = order_cache_key(order_id)
-        ttl = getattr(settings, "CACHE_TTL", 300)
-        client.setex(
-            key,
-            ttl,
-            json.dumps(order_data, default=str),
+        script = client.register_script(_SET_ORDER_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for order_data in orders:
+            script(
+                keys=[order_cache_key(order_data["id"])],
+                args=order_set_args(order_data),
+                client=pipe,
+            )
+        accepted = pipe.execute()
+    except Exception:
+        accepted = [1] * len(orders)
+    for order_data, ok in zip(orders, accepted):
+        if ok != 0:
+            _order_l1.set(order_data["id"], order_data)
+
+
+def order_missing_key(order_id: str) -> str:
+    """Return Redis key of the negative cache entry for an order id."""
+    return f"order:missing:{order_id}"
+
+
+def cache_order_is_missing(order_id: str) -> bool:
+    """
+    Return True if order_id was recently looked up and not found.
+    False on error or when negative caching is disabled.
+    """
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return False
+    try:
+        return bool(get_redis().exists(order_missing_key(order_id)))
+    except Exception:
+        return False
+
+
+def cache_order_set_missing(order_id: str) -> None:
+    """
+    Remember for ORDER_NEGATIVE_CACHE_TTL seconds that order_id does not
+    exist. No-op on error or when disabled.
+    """
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return
+    try:
+        get_redis().set(
+            order_missing_key(order_id),
+            b"1",
+            ex=settings.ORDER_NEGATIVE_CACHE_TTL,
+        )
+    except Exception:
+        pass
+
+
+def cache_order_clear_missing(order_id: str) -> None:
+    """Drop the negative cache entry of a new order. No-op on error."""
+    if settings.ORDER_NEGATIVE_CACHE_TTL <= 0:
+        return
+    try:
+        get_redis().delete(order_missing_key(order_id))
+    except Exception:
+        pass
+
+
+# Random per import; worker_id adds the pid so forked workers differ
+_PROCESS_TOKEN = uuid.uuid4().hex
+
+
+def worker_id() -> str:
+    """Return an id unique to this worker process."""
+    return f"{_PROCESS_TOKEN}.{os.getpid()}"
+
+
+def order_invalidation_message(order_id: str) -> str:
+    """
+    Return the invalidation message for order_id, tagged with this
+    worker's id so its own listener leaves its L1 alone (the writer
+    has already updated or evicted its entry).
+    """
+    return f"{worker_id()}:{order_id}"
+
+
+def cache_order_write_through(
+    order_id: str, order_data: dict[str, Any]
+) -> None:
+    """
+    Store a freshly written order in the cache (version-guarded) instead
+    of deleting it, and broadcast so other workers drop their stale L1
+    copy. No-op on error.
+    """
+    cache_order_set(order_id, order_data)
+    try:
+        get_redis().publish(
+            ORDER_INVALIDATION_CHANNEL, order_invalidation_message(order_id)
         )
     except Exception:
         pass
@@ -60,11 +368,345 @@ def cache_order_set(order_id: str, order_data: dict[str, Any]) -> None:
 
 def cache_order_delete(order_id: str) -> None:
     """
-    Invalidate cache entry for an order. No-op on error.
+    Invalidate cache entry for an order in L1 and Redis, and broadcast the
+    invalidation so other workers drop their L1 copy. No-op on error.
     """
+    _order_l1.delete(order_id)
     try:
         client = get_redis()
         key = order_cache_key(order_id)
         client.delete(key)
+        client.publish(
+            ORDER_INVALIDATION_CHANNEL, order_invalidation_message(order_id)
+        )
+    except Exception:
+        pass
+
+
+def user_orders_version_key(user_id: int) -> str:
+    """Return Redis key of the user's cached orders_version."""
+    return f"orders:user:{user_id}:ver"
+
+
+def user_orders_page_key(user_id: int, version: int, digest: str) -> str:
+    """Return Redis key of a cached list page for one orders_version."""
+    return f"orders:user:{user_id}:v{version}:{digest}"
+
+
+def cache_user_orders_version_get(user_id: int) -> int | None:
+    """Return the user's cached orders_version, or None on miss or error."""
+    try:
+        version = get_redis().get(user_orders_version_key(user_id))
+    except Exception:
+        return None
+    return int(version) if version is not None else None
+
+
+def cache_user_orders_version_set(user_id: int, version: int) -> None:
+    """
+    Cache the user's orders_version unless a newer one is cached, so a
+    reader filling from an old snapshot cannot roll back a writer's
+    update. Expires after ORDER_LIST_CACHE_TTL, which bounds how long a
+    lost update leaves lists on an older version. No-op on error.
+    """
+    try:
+        get_redis().eval(
+            _SET_VERSION_SCRIPT,
+            1,
+            user_orders_version_key(user_id),
+            version,
+            settings.ORDER_LIST_CACHE_TTL,
+        )
+    except Exception:
+        pass
+
+
+def cache_user_orders_get(
+    user_id: int, version: int, digest: str
+) -> dict[str, Any] | None:
+    """
+    Return the cached list page of a user at orders_version, identified
+    by digest (a hash of the query parameters), or None on miss or error.
+    """
+    try:
+        data = get_redis().get(user_orders_page_key(user_id, version, digest))
+    except Exception:
+        return None
+    return _codec.decode(data) if data is not None else None
+
+
+def cache_user_orders_set(
+    user_id: int, version: int, digest: str, page: dict[str, Any]
+) -> None:
+    """
+    Cache a list page under the orders_version its ETag is built from,
+    read before the page was queried. No-op on error.
+    """
+    try:
+        get_redis().setex(
+            user_orders_page_key(user_id, version, digest),
+            settings.ORDER_LIST_CACHE_TTL,
+            _codec.encode(page),
+        )
+    except Exception:
+        pass
+
+
+def order_fill_lock_key(order_id: str) -> str:
+    """Return Redis key of the cross-worker cache fill lock for an order."""
+    return f"lock:order:{order_id}"
+
+
+def acquire_order_fill_lock(order_id: str) -> str | None:
+    """
+    Try to take the short-lived lock for loading an order into the cache.
+    Return a token if acquired, "" if Redis is unavailable (the caller
+    should proceed without a lock), or None if another worker holds it.
+    """
+    token = uuid.uuid4().hex
+    try:
+        acquired = get_redis().set(
+            order_fill_lock_key(order_id),
+            token,
+            nx=True,
+            px=int(settings.ORDER_FILL_LOCK_TTL * 1000),
+        )
+    except Exception:
+        return ""
+    return token if acquired else None
+
+
+def cache_order_poll_fill(
+    order_id: str, with_items: bool
+) -> tuple[dict[str, Any] | None, bool, bool]:
+    """
+    Check on another worker's fill of an order, in one round trip:
+    return (order, missing, locked) where order is the cached entry (or
+    None), missing is True if the order was found not to exist and
+    locked is True while the fill lock is still held. On error return
+    (None, False, False), so the caller stops waiting.
+    """
+    local = _order_l1.get(order_id)
+    if local is not None and (not with_items or "items" in local):
+        return local, False, True
+    try:
+        key = order_cache_key(order_id)
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(key, order_lookup_fields(with_items))
+        pipe.pttl(key)
+        pipe.exists(order_missing_key(order_id))
+        pipe.exists(order_fill_lock_key(order_id))
+        values, pttl, missing, locked = pipe.execute()
+        order = finish_order_lookup(order_id, values, pttl, with_items)[0]
+        return order, bool(missing), bool(locked)
+    except Exception:
+        return None, False, False
+
+
+def release_order_fill_lock(order_id: str, token: str) -> None:
+    """Release a fill lock if it is still held with token. No-op on error."""
+    if not token:
+        return
+    try:
+        script = get_redis().register_script(_RELEASE_LOCK_SCRIPT)
+        script(keys=[order_fill_lock_key(order_id)], args=[token])
+    except Exception:
+        pass
+
+
+def recent_write_key(user_id: int) -> str:
+    """Return Redis key marking that a user wrote recently."""
+    return f"rw:user:{user_id}"
+
+
+def read_your_writes_enabled() -> bool:
+    """Return True if replicas are configured and stickiness is on."""
+    return (
+        bool(settings.DATABASE_REPLICA_URLS)
+        and settings.READ_YOUR_WRITES_SECONDS > 0
+    )
+
+
+def mark_recent_write(user_id: int) -> None:
+    """
+    Pin the user's reads to the primary for READ_YOUR_WRITES_SECONDS,
+    across workers. No-op on error or without replicas.
+    """
+    if not read_your_writes_enabled():
+        return
+    try:
+        get_redis().set(
+            recent_write_key(user_id),
+            b"1",
+            ex=settings.READ_YOUR_WRITES_SECONDS,
+        )
+    except Exception:
+        pass
+
+
+def has_recent_write(user_id: int) -> bool:
+    """
+    Return True if the user wrote within READ_YOUR_WRITES_SECONDS.
+    True on error too, so reads fall back to the primary.
+    """
+    if not read_your_writes_enabled():
+        return False
+    try:
+        return bool(get_redis().exists(recent_write_key(user_id)))
+    except Exception:
+        return True
+
+
+def principal_cache_key(user_id: int) -> str:
+    """Return Redis key for a cached principal."""
+    return f"principal:{user_id}"
+
+
+def cache_principal_get(user_id: int) -> dict[str, Any] | None:
+    """Return the cached principal of a user from L1, then Redis, or None."""
+    data = _principal_l1.get(user_id)
+    if data is not None:
+        return data
+    try:
+        raw = get_redis().get(principal_cache_key(user_id))
+    except Exception:
+        return None
+    if raw is None:
+        _principal_redis_counter.miss()
+        return None
+    _principal_redis_counter.hit()
+    data = _codec.decode(raw)
+    _principal_l1.set(user_id, data)
+    return data
+
+
+def cache_principal_set(data: dict[str, Any]) -> None:
+    """Cache a principal in L1 and Redis. No-op on Redis error."""
+    _principal_l1.set(data["id"], data)
+    try:
+        get_redis().setex(
+            principal_cache_key(data["id"]),
+            settings.PRINCIPAL_CACHE_TTL,
+            _codec.encode(data),
+        )
+    except Exception:
+        pass
+
+
+def cache_principal_delete(user_id: int) -> None:
+    """
+    Evict a user's principal from L1 and Redis and broadcast the
+    eviction so other workers drop their L1 copy. No-op on error.
+    """
+    _principal_l1.delete(user_id)
+    try:
+        client = get_redis()
+        client.delete(principal_cache_key(user_id))
+        client.publish(PRINCIPAL_INVALIDATION_CHANNEL, str(user_id))
     except Exception:
         pass
+
+
+def principal_cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss counters for the L1 and Redis principal tiers."""
+    return {
+        "l1": _principal_l1.stats(),
+        "redis": _principal_redis_counter.stats(),
+    }
+
+
+def order_cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss counters for the L1 and Redis order cache tiers."""
+    return {
+        "l1": _order_l1.stats(),
+        "redis": _order_redis_counter.stats(),
+    }
+
+
+def l1_invalidation_channels() -> list[str]:
+    """Return the invalidation channels of the L1 caches that are enabled."""
+    return [
+        channel
+        for channel, size in (
+            (ORDER_INVALIDATION_CHANNEL, settings.ORDER_L1_CACHE_SIZE),
+            (PRINCIPAL_INVALIDATION_CHANNEL, settings.PRINCIPAL_L1_CACHE_SIZE),
+        )
+        if size > 0
+    ]
+
+
+class OrderInvalidationListener:
+    """
+    Background thread that evicts L1 order and principal entries named
+    on the invalidation channels it subscribes to (by default those of
+    the enabled L1s, see l1_invalidation_channels). After a lost
+    connection both L1s are cleared, since invalidations may have been
+    missed while disconnected.
+    """
+
+    def __init__(
+        self,
+        channels: list[str] | None = None,
+        poll_timeout: float = 1.0,
+    ) -> None:
+        self.channels = (
+            l1_invalidation_channels() if channels is None else channels
+        )
+        self.poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start listening in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="order-cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the thread to exit and wait briefly for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    @staticmethod
+    def evict(channel: bytes, data: bytes) -> None:
+        """
+        Evict the L1 entry named by one invalidation message. Order
+        messages from this worker are skipped; untagged ones evict.
+        """
+        key = data.decode()
+        if channel == _PRINCIPAL_CHANNEL:
+            _principal_l1.delete(int(key))
+            return
+        origin, _, order_id = key.rpartition(":")
+        if origin != worker_id():
+            _order_l1.delete(order_id)
+
+    def _run(self) -> None:
+        """Subscribe and evict until stopped; reconnect with backoff."""
+        backoff = 0.5
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(*self.channels)
+                backoff = 0.5
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=self.poll_timeout)
+                    if message is not None:
+                        self.evict(message["channel"], message["data"])
+            except Exception:
+                logger.debug("Order invalidation listener disconnected")
+                _order_l1.clear()
+                _principal_l1.clear()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
@@ -1,32 +1,105 @@
 """Password hashing and JWT utilities for authentication."""
 
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pwdlib import PasswordHash
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+from app.core import async_redis_client
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_read_db, pin_to_primary
+from app.core.local_cache import TTLCache
+from app.core.password_hashing import (
+    PasswordHashPoolSaturated,
+    hash_password_now,
+    password_pool,
+    verify_password_now,
+)
+from app.core.redis_client import (
+    cache_principal_delete,
+    cache_principal_get,
+    cache_principal_set,
+    has_recent_write,
+)
 from app.models.user import User
 
-# Password hasher (argon2 via pwdlib)
-_password_hash = PasswordHash.recommended()
-
 security_scheme = HTTPBearer(auto_error=False)
 
+# Decoded payloads of verified tokens by token digest, each kept until
+# the token's exp (the per-entry TTL)
+_token_cache = TTLCache(settings.JWT_CACHE_SIZE, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user as cached for protected routes."""
+
+    id: int
+    email: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build the principal of a loaded User."""
+        return cls(id=user.id, email=user.email)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the cached representation."""
+        return {"id": self.id, "email": self.email}
+
+
+def _hashing_unavailable() -> HTTPException:
+    """503 for a saturated password hashing pool."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent logins, retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
 
 def hash_password(password: str) -> str:
-    """Hash a plain-text password using pwdlib (argon2)."""
-    return _password_hash.hash(password)
+    """Hash a plain-text password (argon2) in the hashing pool; 503 if full."""
+    try:
+        return password_pool.run(hash_password_now, password)
+    except PasswordHashPoolSaturated:
+        raise _hashing_unavailable()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a pwdlib hash."""
-    return _password_hash.verify(plain_password, hashed_password)
+    """Verify a plain password against an argon2 hash; 503 if pool full."""
+    try:
+        return password_pool.run(
+            verify_password_now, plain_password, hashed_password
+        )
+    except PasswordHashPoolSaturated:
+        raise _hashing_unavailable()
+
+
+async def hash_password_async(password: str) -> str:
+    """Async hash_password for ASYNC_MODE routes."""
+    try:
+        return await password_pool.run_async(hash_password_now, password)
+    except PasswordHashPoolSaturated:
+        raise _hashing_unavailable()
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """Async verify_password for ASYNC_MODE routes."""
+    try:
+        return await password_pool.run_async(
+            verify_password_now, plain_password, hashed_password
+        )
+    except PasswordHashPoolSaturated:
+        raise _hashing_unavailable()
 
 
 def create_access_token(sub: str | int) -> str:
@@ -42,25 +115,39 @@ def create_access_token(sub: str | int) -> str:
 
 
 def decode_access_token(token: str) -> dict[str, Any] | None:
-    """Decode and validate JWT; return payload or None if invalid/expired."""
+    """
+    Decode and validate JWT; return payload or None if invalid/expired.
+    Verified payloads are cached by token digest until their exp, so a
+    client reusing its token skips the signature check.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        # The entry TTL is monotonic; also honour exp if the clock moved
+        if payload["exp"] > time.time():
+            return payload
+        _token_cache.delete(key)
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        return payload
     except jwt.PyJWTError:
         return None
+    remaining = payload.get("exp", 0) - time.time()
+    if remaining > 0:
+        _token_cache.set(key, payload, ttl=remaining)
+    return payload
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(
-        security_scheme
-    ),
-    db: Session = Depends(get_db),
-) -> User:
-    """Extract Bearer token, validate JWT, and return the current user."""
+def token_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters and size of the verified token cache."""
+    return _token_cache.stats()
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials | None) -> int:
+    """Validate the Bearer JWT and return its user id; 401 otherwise."""
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,14 +169,17 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     try:
-        user_id = int(sub)
+        return int(sub)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.get(User, user_id)
+
+
+def _require_user(user: User | None) -> User:
+    """Return user, or 401 if the token's user no longer exists."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,3 +187,95 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     return user
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        security_scheme
+    ),
+    db: Session = Depends(get_read_db),
+) -> User:
+    """
+    Extract Bearer token, validate JWT, and return the current user.
+    The lookup uses the request's read session, which is pinned to the
+    primary if the user wrote recently, before anything else reads.
+    """
+    user_id = _token_user_id(credentials)
+    if has_recent_write(user_id):
+        pin_to_primary(db)
+    return _require_user(db.get(User, user_id))
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        security_scheme
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """Async get_current_user for ASYNC_MODE routes."""
+    user_id = _token_user_id(credentials)
+    return _require_user(await db.get(User, user_id))
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        security_scheme
+    ),
+    db: Session = Depends(get_read_db),
+) -> Principal:
+    """
+    Like get_current_user, but served from the principal cache when
+    possible; only a miss loads the User. Sessions connect lazily, so a
+    cache hit needs no DB connection for authentication.
+    """
+    user_id = _token_user_id(credentials)
+    if has_recent_write(user_id):
+        pin_to_primary(db)
+    data = cache_principal_get(user_id)
+    if data is not None:
+        return Principal(**data)
+    principal = Principal.from_user(_require_user(db.get(User, user_id)))
+    cache_principal_set(principal.to_dict())
+    return principal
+
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        security_scheme
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """Async get_current_principal for ASYNC_MODE routes."""
+    user_id = _token_user_id(credentials)
+    data = await async_redis_client.cache_principal_get(user_id)
+    if data is not None:
+        return Principal(**data)
+    principal = Principal.from_user(_require_user(await db.get(User, user_id)))
+    await async_redis_client.cache_principal_set(principal.to_dict())
+    return principal
+
+
+@event.listens_for(User, "after_delete")
+def _remember_deleted_user(mapper, connection, target: User) -> None:
+    """Note a deleted user on its session, for eviction on commit."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("deleted_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_deleted_principals(session: Session) -> None:
+    """
+    Evict the principals of users deleted in the committed transaction.
+    Done after commit, so a concurrent miss does not re-cache the user
+    from the not yet committed state. Bulk DELETE statements bypass
+    this; call cache_principal_delete for those users.
+    """
+    for user_id in session.info.pop("deleted_user_ids", ()):
+        cache_principal_delete(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_deleted_users(session: Session) -> None:
+    """Drop pending evictions of a rolled back transaction."""
+    session.info.pop("deleted_user_ids", None)
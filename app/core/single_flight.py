@@ -0,0 +1,103 @@
+"""Request coalescing (single-flight) and probabilistic early refresh."""
+
+import asyncio
+import math
+import random
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    """An in-flight call whose result is shared with concurrent waiters."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls per key within this process: the first
+    caller runs the function, later callers for the same key block until
+    it finishes and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn once per key across concurrent callers; return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once per key across concurrent callers. If the leading
+        caller is cancelled, a waiter takes over and runs its own fn
+        instead of receiving the leader's cancellation.
+        """
+        while (call := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not call.cancelled() or (
+                    current is not None and current.cancelling()
+                ):
+                    raise
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            # Mark retrieved so a call without waiters does not warn
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+def should_refresh_early(ttl: float, delta: float, beta: float) -> bool:
+    """
+    Probabilistic early expiration (XFetch): return True with a
+    probability that rises as the remaining ttl approaches the time delta
+    it took to compute the value. beta > 1 favours earlier refreshes;
+    beta <= 0 disables early refresh.
+    """
+    if beta <= 0 or delta <= 0:
+        return False
+    return -delta * beta * math.log(1.0 - random.random()) >= ttl
@@ -1,22 +1,63 @@
 """Main application module."""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from app.routes.auth import router as auth_router
-from app.routes.orders import router as orders_router
+from app.core.async_redis_client import close_redis
+from app.core.config import settings
+from app.core.database import dispose_async_engine
+from app.core.password_hashing import password_pool
+from app.core.query_metrics import QueryMetricsMiddleware
+from app.core.redis_client import (
+    OrderInvalidationListener,
+    l1_invalidation_channels,
+)
+from app.routes.internal import router as internal_router
+
+if settings.ASYNC_MODE:
+    from app.routes.async_auth import router as auth_router
+    from app.routes.async_orders import router as orders_router
+else:
+    from app.routes.auth import router as auth_router
+    from app.routes.orders import router as orders_router
 
 # Create rate limiter instance
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop per-worker background services."""
+    # Spawn the hashing processes before the first login needs them
+    await asyncio.to_thread(password_pool.start)
+    listener = None
+    channels = l1_invalidation_channels()
+    if channels:
+        # Keep this worker's L1 order and principal caches in sync with
+        # other workers
+        listener = OrderInvalidationListener(channels)
+        listener.start()
+    yield
+    if listener is not None:
+        listener.stop()
+    await asyncio.to_thread(password_pool.shutdown)
+    if settings.ASYNC_MODE:
+        await close_redis()
+        await dispose_async_engine()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="E-Commerce Order API",
     description="REST API for managing e-commerce orders",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add rate limiter to app state
@@ -38,8 +79,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Query count and DB time per request (Server-Timing header, slow logs)
+app.add_middleware(QueryMetricsMiddleware)
+
 app.include_router(auth_router)
 app.include_router(orders_router)
+app.include_router(internal_router)
 
 
 @app.get("/")
@@ -1,6 +1,8 @@
 """SQLAlchemy models."""
 
 from app.models.order import Order
+from app.models.order_archive import OrderArchive
+from app.models.order_summary import UserOrderSummary
 from app.models.user import User
 
-__all__ = ["Order", "User"]
+__all__ = ["Order", "OrderArchive", "User", "UserOrderSummary"]
@@ -9,10 +9,13 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -28,9 +31,56 @@ class OrderStatus:
 
 
 class Order(Base):
-    """Order model: UUID id, user_id FK, items JSON, total_price, status, created_at."""
+    """Order model: UUID id, user_id FK, items JSON, total_price, status, created_at, version."""
 
     __tablename__ = "orders"
+    # On Postgres the table is range-partitioned by created_at month and
+    # its primary key is (id, created_at) (migration 008), so the database
+    # no longer enforces unique ids across partitions. Ids are unique only
+    # because they are always generated here as uuid4 (never taken from
+    # clients); the mapper, caches and lookups by id rely on that
+    __table_args__ = (
+        # Containment (@>) search over items, e.g. by SKU (Postgres only)
+        Index(
+            "ix_orders_items_gin",
+            "items",
+            postgresql_using="gin",
+            postgresql_ops={"items": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Keyset pagination of a user's orders by (created_at, id); also
+        # serves lookups by user_id alone
+        Index(
+            "ix_orders_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+        # Status-filtered listing of a user's orders
+        Index(
+            "ix_orders_user_id_status_created_at",
+            "user_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # Partial indexes for the hot, frequently filtered states
+        Index(
+            "ix_orders_pending_user_id_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "ix_orders_paid_user_id_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'PAID'"),
+            sqlite_where=text("status = 'PAID'"),
+        ),
+    )
 
     id = Column(
         String(36),
@@ -41,9 +91,13 @@ class Order(Base):
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
-    items = Column(JSON, nullable=False, default=list)
+    # JSONB on Postgres so SKU lookups can use @> and the GIN index
+    items = Column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=False,
+        default=list,
+    )
     total_price = Column(Float, nullable=False)
     status = Column(
         Enum(
@@ -62,5 +116,7 @@ class Order(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+    # Row version, incremented on every status change (used for ETags)
+    version = Column(Integer, nullable=False, default=1)
 
     user = relationship("User", backref="orders")
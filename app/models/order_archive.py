@@ -0,0 +1,61 @@
+"""Archived order model: closed orders moved out of the hot orders table."""
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import Base
+
+
+class OrderArchive(Base):
+    """
+    Order moved here by the archive job (SHIPPED or CANCELED, older than
+    ORDER_ARCHIVE_AFTER_DAYS). Same columns as Order plus archived_at.
+    """
+
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        # Keyset pagination of a user's archived orders by (created_at, id)
+        Index(
+            "ix_orders_archive_user_id_created_at_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    items = Column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=False,
+        default=list,
+    )
+    total_price = Column(Float, nullable=False)
+    status = Column(
+        Enum(
+            "PENDING",
+            "PAID",
+            "SHIPPED",
+            "CANCELED",
+            name="order_status",
+            create_constraint=True,
+        ),
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,27 @@
+"""Per-user order rollup model, maintained incrementally on order writes."""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class UserOrderSummary(Base):
+    """Order counts per status, total spend and last order time for a user."""
+
+    __tablename__ = "user_order_summaries"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    pending_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+    shipped_count = Column(Integer, nullable=False, default=0)
+    canceled_count = Column(Integer, nullable=False, default=0)
+    # Sum of total_price over the user's orders that are not CANCELED
+    total_spend = Column(Float, nullable=False, default=0.0)
+    last_order_at = Column(DateTime(timezone=True), nullable=True)
+    # Incremented on every order create or status change for the user;
+    # list ETags are derived from it
+    orders_version = Column(Integer, nullable=False, default=0)
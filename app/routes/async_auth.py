@@ -0,0 +1,89 @@
+"""Async authentication routes (ASYNC_MODE): same API as app.routes.auth.
+
+Password hashing and verification are CPU-bound, so they are awaited
+from the password hashing process pool; the DB calls await an
+AsyncSession.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.async_redis_client import cache_principal_set
+from app.core.database import get_async_db
+from app.core.security import (
+    Principal,
+    create_access_token,
+    get_current_user_async,
+    hash_password_async,
+    verify_password_async,
+)
+from app.models.user import User
+from app.schemas.auth import Token
+from app.schemas.user import UserCreate, UserResponse
+
+router = APIRouter(prefix="", tags=["auth"])
+
+
+@router.post(
+    "/register/",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Register a new user",
+)
+async def register(
+    user_in: UserCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """Create a user with email and hashed password. Returns 409 if email exists."""
+    existing = await db.scalar(select(User).where(User.email == user_in.email))
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already registered",
+        )
+    user = User(
+        email=user_in.email,
+        hashed_password=await hash_password_async(user_in.password),
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+@router.post(
+    "/token/",
+    response_model=Token,
+    summary="OAuth2 password flow login",
+)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Accept username (email) and password; return JWT access token or 401."""
+    user = await db.scalar(
+        select(User).where(User.email == form_data.username)
+    )
+    if user is None or not await verify_password_async(
+        form_data.password, user.hashed_password
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # The client's next calls are authenticated from the principal cache
+    await cache_principal_set(Principal.from_user(user).to_dict())
+    access_token = create_access_token(sub=user.id)
+    return Token(access_token=access_token, token_type="bearer")
+
+
+@router.get(
+    "/users/me/",
+    response_model=UserResponse,
+    summary="Get current user",
+)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    """Return the authenticated user (protected route)."""
+    return current_user
@@ -0,0 +1,220 @@
+"""Async order routes (ASYNC_MODE): same API as app.routes.orders.
+
+Create, get by id, update status and list run as async handlers on an
+AsyncSession and the asyncio Redis client. Bulk create, batch, search,
+export and summary are shared with the sync router and still run in
+the threadpool.
+"""
+
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.etag import etag_matches
+from app.core.security import Principal, get_current_principal_async
+from app.routes.orders import (
+    _list_etag,
+    _not_modified,
+    _order_etag,
+    requested_fields,
+    valid_order_id,
+)
+from app.routes.orders import router as sync_router
+from app.schemas.order import (
+    OrderCreate,
+    OrderPage,
+    OrderResponse,
+    OrderStatusLiteral,
+    OrderUpdate,
+)
+from app.services.async_order_service import (
+    create_order,
+    get_list_version,
+    get_order_by_id,
+    list_orders_by_user,
+    update_order_status,
+)
+from app.services.order_service import project_order
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+# Sync handlers served unchanged in async mode
+SHARED_SYNC_ROUTES = frozenset(
+    {
+        "post_orders_bulk",
+        "post_orders_batch",
+        "search_orders",
+        "export_orders",
+        "get_orders_summary",
+    }
+)
+
+
+@router.post(
+    "/",
+    response_model=OrderResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create an order",
+)
+async def post_order(
+    body: OrderCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    """Create an order for the authenticated user; publish new_order event. 401 if unauthenticated."""
+    order = await create_order(db, user_id=current_user.id, data=body)
+    return OrderResponse.model_validate(order)
+
+
+@router.get(
+    "/user/{user_id}",
+    response_model=OrderPage,
+    summary="List orders for a user",
+)
+async def list_orders(
+    user_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        settings.ORDERS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.ORDERS_PAGE_MAX_LIMIT,
+    ),
+    cursor: str | None = Query(None, description="Cursor from next_cursor"),
+    status_filter: OrderStatusLiteral | None = Query(
+        None, alias="status", description="Only orders with this status"
+    ),
+    created_from: datetime | None = Query(
+        None, description="Only orders created at or after this time"
+    ),
+    created_to: datetime | None = Query(
+        None, description="Only orders created before this time"
+    ),
+    fields: frozenset[str] | None = Depends(requested_fields),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    """List one page of orders for user_id, newest first, optionally filtered by status and creation time. Sends an ETag from the user's orders_version; 304 on If-None-Match. Only when path user_id matches current user; 403 otherwise. 400 on a bad cursor or fields, 401 if unauthenticated."""
+    etag = orders_version = None
+    if user_id == current_user.id:
+        orders_version = await get_list_version(db, user_id)
+        etag = _list_etag(user_id, orders_version, request)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+    try:
+        page = await list_orders_by_user(
+            db,
+            user_id=user_id,
+            current_user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            status=status_filter,
+            created_from=created_from,
+            created_to=created_to,
+            orders_version=orders_version,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if page is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to list another user's orders",
+        )
+    orders, next_cursor = page
+    if fields is not None:
+        return JSONResponse(
+            {"items": orders, "next_cursor": next_cursor},
+            headers={"ETag": etag},
+        )
+    response.headers["ETag"] = etag
+    return OrderPage(
+        items=[OrderResponse.model_validate(o) for o in orders],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{order_id}",
+    response_model=OrderResponse,
+    summary="Get order by ID",
+)
+async def get_order(
+    response: Response,
+    order_id: str = Depends(valid_order_id),
+    fields: frozenset[str] | None = Depends(requested_fields),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    """Get order by id (cache-first), optionally projected to ?fields=. Sends a strong ETag from the order version; 304 on If-None-Match. Only own order; 404 otherwise. 400 on bad fields, 401 if unauthenticated."""
+    data = await get_order_by_id(
+        db,
+        order_id=order_id,
+        current_user_id=current_user.id,
+        fields=fields,
+    )
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+    # One lookup serves both the ETag check and the body
+    etag = _order_etag(order_id, data["version"], fields)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    if fields is not None:
+        return JSONResponse(
+            project_order(data, fields), headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return OrderResponse.model_validate(data)
+
+
+@router.patch(
+    "/{order_id}",
+    response_model=OrderResponse,
+    summary="Update order status",
+)
+async def patch_order(
+    body: OrderUpdate,
+    order_id: str = Depends(valid_order_id),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    """Update order status only if owned by current user; invalidate cache. 404/401 otherwise."""
+    order = await update_order_status(
+        db, order_id=order_id, current_user_id=current_user.id, data=body
+    )
+    if order is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+    return OrderResponse.model_validate(order)
+
+
+# Registered after the async handlers; none of their paths and methods
+# overlap, so the order only affects the OpenAPI listing
+router.routes.extend(
+    route
+    for route in sync_router.routes
+    if getattr(route, "name", None) in SHARED_SYNC_ROUTES
+)
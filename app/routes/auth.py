@@ -5,7 +5,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.redis_client import cache_principal_set, mark_recent_write
 from app.core.security import (
+    Principal,
     create_access_token,
     get_current_user,
     hash_password,
@@ -39,6 +41,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    mark_recent_write(user.id)
     return user
 
 
@@ -61,6 +64,8 @@ def login(
             detail="Invalid email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # The client's next calls are authenticated from the principal cache
+    cache_principal_set(Principal.from_user(user).to_dict())
     access_token = create_access_token(sub=user.id)
     return Token(access_token=access_token, token_type="bearer")
 
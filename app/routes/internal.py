@@ -0,0 +1,53 @@
+"""Internal operational endpoints (metrics). Not part of the public API.
+
+Each endpoint requires the INTERNAL_API_TOKEN in an X-Internal-Token
+header and answers 404 otherwise, or always when no token is configured.
+"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.pool_metrics import all_pool_stats
+from app.core.redis_client import order_cache_stats, principal_cache_stats
+from app.core.security import token_cache_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(None),
+) -> None:
+    """404 unless the request carries the configured internal token."""
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected or not hmac.compare_digest(
+        (x_internal_token or "").encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+
+@router.get(
+    "/cache/stats",
+    summary="Order, principal and token cache hit/miss counters",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+def get_cache_stats():
+    """Return hit/miss counters of this worker's caches, per tier."""
+    return {
+        "orders": order_cache_stats(),
+        "principals": principal_cache_stats(),
+        "tokens": token_cache_stats(),
+    }
+
+
+@router.get(
+    "/db/pool",
+    summary="DB connection pool usage and checkout timings",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+def get_db_pool_stats():
+    """Return pool state, peaks, timeouts and timings of this worker."""
+    return {"pools": all_pool_stats()}
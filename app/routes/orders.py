@@ -1,22 +1,105 @@
 """Order routes: create, get by id, update status, list by user. All require JWT."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User
-from app.schemas.order import OrderCreate, OrderResponse, OrderUpdate
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.etag import etag_matches, make_etag, short_digest
+from app.core.security import Principal, get_current_principal
+from app.schemas.order import (
+    OrderBatchRequest,
+    OrderBatchResponse,
+    OrderBulkCreate,
+    OrderBulkResponse,
+    OrderCreate,
+    OrderPage,
+    OrderResponse,
+    OrderStatusLiteral,
+    OrderSummaryResponse,
+    OrderUpdate,
+)
 from app.services.order_service import (
     create_order,
+    create_orders_bulk,
+    export_orders_by_user,
+    get_list_version,
     get_order_by_id,
+    get_orders_by_ids,
+    is_valid_order_id,
     list_orders_by_user,
+    parse_order_fields,
+    project_order,
     update_order_status,
 )
+from app.services.order_summary_service import get_user_summary
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+def requested_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated sparse fieldset, e.g. id,status",
+    ),
+) -> frozenset[str] | None:
+    """Dependency: parse ?fields= into a projection; 400 if invalid."""
+    try:
+        return parse_order_fields(fields)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid fields",
+        )
+
+
+def valid_order_id(order_id: str) -> str:
+    """
+    Dependency: 404 for ids that are not canonical UUIDs. Declared before
+    authentication so malformed ids cost no Redis or DB round trip.
+    """
+    if not is_valid_order_id(order_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found",
+        )
+    return order_id
+
+
+def _order_etag(
+    order_id: str, version: int, fields: frozenset[str] | None
+) -> str:
+    """ETag of one order representation (version plus fieldset)."""
+    if fields is None:
+        return make_etag(order_id, version)
+    return make_etag(order_id, version, short_digest(fields))
+
+
+def _list_etag(user_id: int, orders_version: int, request: Request) -> str:
+    """ETag of a list page: the user's orders_version plus the query."""
+    query = [f"{k}={v}" for k, v in request.query_params.multi_items()]
+    return make_etag(f"u{user_id}", orders_version, short_digest(query))
+
+
+def _not_modified(etag: str) -> Response:
+    """Return an empty 304 response carrying the current ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
 @router.post(
     "/",
     response_model=OrderResponse,
@@ -26,33 +109,215 @@ router = APIRouter(prefix="/orders", tags=["orders"])
 def post_order(
     body: OrderCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Create an order for the authenticated user; publish new_order event. 401 if unauthenticated."""
     order = create_order(db, user_id=current_user.id, data=body)
     return OrderResponse.model_validate(order)
 
 
+@router.post(
+    "/bulk",
+    response_model=OrderBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many orders",
+)
+def post_orders_bulk(
+    body: OrderBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Create up to ORDER_BULK_MAX_ITEMS orders for the authenticated user in one transaction; publish a new_order event per order. Returns the created orders in request order. The batch is all or nothing, with no per-item results: if any order is invalid the request fails with 422 (the error loc names its index, e.g. ["body", "orders", 1, "total_price"]) and if the insert fails nothing is created. Split input into separate requests to isolate failures. 401 if unauthenticated."""
+    orders = create_orders_bulk(db, user_id=current_user.id, data=body.orders)
+    return OrderBulkResponse(
+        orders=[OrderResponse.model_validate(o) for o in orders]
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=OrderBatchResponse,
+    summary="Get many orders by id",
+)
+def post_orders_batch(
+    body: OrderBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Get up to ORDER_BATCH_MAX_IDS own orders in request order (cache-first, one DB query for misses). Unknown or foreign ids are listed in not_found. 401 if unauthenticated."""
+    orders = get_orders_by_ids(
+        db, order_ids=body.ids, current_user_id=current_user.id
+    )
+    returned = {o["id"] for o in orders}
+    return OrderBatchResponse(
+        orders=[OrderResponse.model_validate(o) for o in orders],
+        not_found=[
+            order_id
+            for order_id in dict.fromkeys(body.ids)
+            if order_id not in returned
+        ],
+    )
+
+
 @router.get(
     "/user/{user_id}",
-    response_model=list[OrderResponse],
+    response_model=OrderPage,
     summary="List orders for a user",
 )
 def list_orders(
+    user_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        settings.ORDERS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.ORDERS_PAGE_MAX_LIMIT,
+    ),
+    cursor: str | None = Query(None, description="Cursor from next_cursor"),
+    status_filter: OrderStatusLiteral | None = Query(
+        None, alias="status", description="Only orders with this status"
+    ),
+    created_from: datetime | None = Query(
+        None, description="Only orders created at or after this time"
+    ),
+    created_to: datetime | None = Query(
+        None, description="Only orders created before this time"
+    ),
+    fields: frozenset[str] | None = Depends(requested_fields),
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """List one page of orders for user_id, newest first, optionally filtered by status and creation time. Sends an ETag from the user's orders_version; 304 on If-None-Match. Only when path user_id matches current user; 403 otherwise. 400 on a bad cursor or fields, 401 if unauthenticated."""
+    etag = orders_version = None
+    if user_id == current_user.id:
+        orders_version = get_list_version(db, user_id)
+        etag = _list_etag(user_id, orders_version, request)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+    try:
+        page = list_orders_by_user(
+            db,
+            user_id=user_id,
+            current_user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            status=status_filter,
+            created_from=created_from,
+            created_to=created_to,
+            orders_version=orders_version,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if page is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to list another user's orders",
+        )
+    orders, next_cursor = page
+    if fields is not None:
+        # Projected rows are already JSON-ready; skip OrderResponse
+        return JSONResponse(
+            {"items": orders, "next_cursor": next_cursor},
+            headers={"ETag": etag},
+        )
+    response.headers["ETag"] = etag
+    return OrderPage(
+        items=[OrderResponse.model_validate(o) for o in orders],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/user/{user_id}/search",
+    response_model=OrderPage,
+    summary="Find a user's orders containing an item SKU",
+)
+def search_orders(
+    user_id: int,
+    sku: str = Query(..., min_length=1, description="Item SKU to find"),
+    limit: int = Query(
+        settings.ORDERS_PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.ORDERS_PAGE_MAX_LIMIT,
+    ),
+    cursor: str | None = Query(None, description="Cursor from next_cursor"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """List one page of user_id's orders with an item whose sku matches, newest first (JSONB containment on Postgres). Only when path user_id matches current user; 403 otherwise. 400 on a bad cursor, 401 if unauthenticated."""
+    try:
+        page = list_orders_by_user(
+            db,
+            user_id=user_id,
+            current_user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            sku=sku,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if page is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to search another user's orders",
+        )
+    orders, next_cursor = page
+    return OrderPage(
+        items=[OrderResponse.model_validate(o) for o in orders],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/user/{user_id}/export",
+    response_class=StreamingResponse,
+    summary="Export all orders for a user as NDJSON",
+)
+def export_orders(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """List orders for user_id. Only when path user_id matches current user; 403 otherwise. 401 if unauthenticated."""
-    orders = list_orders_by_user(
+    """Stream every order for user_id as newline-delimited JSON, newest first. Only when path user_id matches current user; 403 otherwise. 401 if unauthenticated."""
+    lines = export_orders_by_user(
         db, user_id=user_id, current_user_id=current_user.id
     )
-    if orders is None:
+    if lines is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to list another user's orders",
+            detail="Not allowed to export another user's orders",
         )
-    return [OrderResponse.model_validate(o) for o in orders]
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get(
+    "/user/{user_id}/summary",
+    response_model=OrderSummaryResponse,
+    summary="Get order summary for a user",
+)
+def get_orders_summary(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Return counts per status, total spend and last order time from the rollup table. Only when path user_id matches current user; 403 otherwise. 401 if unauthenticated."""
+    summary = get_user_summary(
+        db, user_id=user_id, current_user_id=current_user.id
+    )
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to view another user's summary",
+        )
+    return OrderSummaryResponse.model_validate(summary)
 
 
 @router.get(
@@ -61,19 +326,34 @@ def list_orders(
     summary="Get order by ID",
 )
 def get_order(
-    order_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    order_id: str = Depends(valid_order_id),
+    fields: frozenset[str] | None = Depends(requested_fields),
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Get order by id (cache-first). Only own order; 404 otherwise. 401 if unauthenticated."""
+    """Get order by id (cache-first), optionally projected to ?fields=. Sends a strong ETag from the order version; 304 on If-None-Match. Only own order; 404 otherwise. 400 on bad fields, 401 if unauthenticated."""
     data = get_order_by_id(
-        db, order_id=order_id, current_user_id=current_user.id
+        db,
+        order_id=order_id,
+        current_user_id=current_user.id,
+        fields=fields,
     )
     if data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found",
         )
+    # One lookup serves both the ETag check and the body
+    etag = _order_etag(order_id, data["version"], fields)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    if fields is not None:
+        return JSONResponse(
+            project_order(data, fields), headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     return OrderResponse.model_validate(data)
 
 
@@ -83,10 +363,10 @@ def get_order(
     summary="Update order status",
 )
 def patch_order(
-    order_id: str,
     body: OrderUpdate,
+    order_id: str = Depends(valid_order_id),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update order status only if owned by current user; invalidate cache. 404/401 otherwise."""
     order = update_order_status(
@@ -5,6 +5,8 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 OrderStatusLiteral = Literal["PENDING", "PAID", "SHIPPED", "CANCELED"]
 
 
@@ -17,6 +19,20 @@ class OrderCreate(BaseModel):
     total_price: float = Field(..., gt=0, description="Total price")
 
 
+class OrderBulkCreate(BaseModel):
+    """Schema for creating many orders in one request."""
+
+    orders: list[OrderCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.ORDER_BULK_MAX_ITEMS,
+        description=(
+            "Orders to create, all or nothing: one invalid order rejects "
+            "the whole request"
+        ),
+    )
+
+
 class OrderUpdate(BaseModel):
     """Schema for updating an order (status only)."""
 
@@ -35,5 +51,53 @@ class OrderResponse(BaseModel):
     total_price: float
     status: str
     created_at: datetime
+    version: int
 
     model_config = {"from_attributes": True}
+
+
+class OrderPage(BaseModel):
+    """Schema for one page of orders with an opaque cursor to the next."""
+
+    items: list[OrderResponse]
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page; null on the last page"
+    )
+
+
+class OrderSummaryResponse(BaseModel):
+    """Schema for a user's order rollup."""
+
+    user_id: int
+    counts: dict[str, int] = Field(..., description="Order count per status")
+    total_spend: float = Field(
+        ..., description="Sum of total_price over non-canceled orders"
+    )
+    last_order_at: datetime | None
+
+
+class OrderBatchRequest(BaseModel):
+    """Schema for fetching many orders by id in one request."""
+
+    ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.ORDER_BATCH_MAX_IDS,
+        description="Order ids to fetch",
+    )
+
+
+class OrderBatchResponse(BaseModel):
+    """Schema for a batch fetch: found orders in request order."""
+
+    orders: list[OrderResponse]
+    not_found: list[str] = Field(
+        default_factory=list,
+        description="Requested ids that do not exist or are not yours",
+    )
+
+
+class OrderBulkResponse(BaseModel):
+    """Schema for a bulk create: one created order per input, in order."""
+
+    orders: list[OrderResponse]
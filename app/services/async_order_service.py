@@ -0,0 +1,198 @@
+"""Async order service for ASYNC_MODE: create, get by id, update, list.
+
+Cache I/O goes through redis.asyncio. DB work reuses the sync query
+functions of order_service via AsyncSession.run_sync, which runs them on
+the event loop's greenlet bridge instead of a threadpool thread.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import async_redis_client as cache
+from app.core.config import settings
+from app.core.events import publish_new_order
+from app.core.single_flight import AsyncSingleFlight, should_refresh_early
+from app.schemas.order import OrderCreate, OrderUpdate
+from app.services.order_service import (
+    _HEAD_FIELDS,
+    _is_complete,
+    _wants_items,
+    apply_status_update,
+    insert_order,
+    is_valid_order_id,
+    list_page_digest,
+    query_order,
+    query_orders_page,
+)
+from app.services.order_summary_service import (
+    get_orders_version,
+    pop_orders_versions,
+)
+
+# Coalesces concurrent cache-miss loads of the same order on this loop.
+_order_loads = AsyncSingleFlight()
+
+
+async def cache_list_versions(db: AsyncSession) -> None:
+    """See order_service.cache_list_versions."""
+    for user_id, version in pop_orders_versions(db.sync_session).items():
+        await cache.cache_user_orders_version_set(user_id, version)
+
+
+async def get_list_version(db: AsyncSession, user_id: int) -> int:
+    """See order_service.get_list_version."""
+    version = await cache.cache_user_orders_version_get(user_id)
+    if version is None:
+        version = await db.run_sync(get_orders_version, user_id)
+        await cache.cache_user_orders_version_set(user_id, version)
+    return version
+
+
+async def create_order(
+    db: AsyncSession, user_id: int, data: OrderCreate
+) -> dict[str, Any]:
+    """See order_service.create_order."""
+    order = await db.run_sync(insert_order, user_id, data)
+    await cache.mark_recent_write(user_id)
+    await cache.cache_order_clear_missing(order["id"])
+    if settings.CACHE_WRITE_MODE == "write_through":
+        await cache.cache_order_set(order["id"], order)
+    await cache_list_versions(db)
+    # pika is blocking; keep it off the event loop
+    await asyncio.to_thread(
+        publish_new_order, order_id=order["id"], user_id=user_id
+    )
+    return order
+
+
+async def _load_order(
+    db: AsyncSession, order_id: str, with_items: bool
+) -> dict[str, Any] | None:
+    """See order_service._load_order."""
+    token = await cache.acquire_order_fill_lock(order_id)
+    if token is None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.ORDER_FILL_LOCK_TTL
+        while loop.time() < deadline:
+            await asyncio.sleep(settings.ORDER_FILL_POLL_INTERVAL)
+            cached, missing, locked = await cache.cache_order_poll_fill(
+                order_id, with_items
+            )
+            if _is_complete(cached, with_items):
+                return cached
+            if missing:
+                return None
+            if not locked:
+                break
+    return await _query_and_fill(db, order_id, with_items, token)
+
+
+async def _query_and_fill(
+    db: AsyncSession, order_id: str, with_items: bool, token: str | None
+) -> dict[str, Any] | None:
+    """See order_service._query_and_fill."""
+    try:
+        data, elapsed = await db.run_sync(query_order, order_id, with_items)
+        if data is None:
+            await cache.cache_order_set_missing(order_id)
+            return None
+        await cache.cache_order_set(order_id, data, compute_time=elapsed)
+        return data
+    finally:
+        if token:
+            await cache.release_order_fill_lock(order_id, token)
+
+
+async def get_order_by_id(
+    db: AsyncSession,
+    order_id: str,
+    current_user_id: int,
+    fields: frozenset[str] | None = None,
+) -> dict[str, Any] | None:
+    """See order_service.get_order_by_id."""
+    if not is_valid_order_id(order_id):
+        return None
+    with_items = _wants_items(fields)
+    cached, ttl, delta = await cache.cache_order_lookup(order_id, with_items)
+    if cached is not None and _HEAD_FIELDS <= cached.keys():
+        if cached.get("user_id") != current_user_id:
+            return None
+        if ttl is not None and should_refresh_early(
+            ttl, delta, settings.ORDER_EARLY_REFRESH_BETA
+        ):
+            token = await cache.acquire_order_fill_lock(order_id)
+            if token:
+                await _query_and_fill(db, order_id, with_items, token)
+        return cached
+    if await cache.cache_order_is_missing(order_id):
+        return None
+    data = await _order_loads.do(
+        (order_id, with_items),
+        lambda: _load_order(db, order_id, with_items),
+    )
+    if data is None or data.get("user_id") != current_user_id:
+        return None
+    return data
+
+
+async def update_order_status(
+    db: AsyncSession, order_id: str, current_user_id: int, data: OrderUpdate
+) -> dict[str, Any] | None:
+    """See order_service.update_order_status."""
+    order = await db.run_sync(
+        apply_status_update, order_id, current_user_id, data
+    )
+    if order is None:
+        return None
+    await cache.mark_recent_write(current_user_id)
+    if settings.CACHE_WRITE_MODE == "write_through":
+        await cache.cache_order_write_through(order_id, order)
+    else:
+        await cache.cache_order_delete(order_id)
+    await cache_list_versions(db)
+    return order
+
+
+async def list_orders_by_user(
+    db: AsyncSession,
+    user_id: int,
+    current_user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    fields: frozenset[str] | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    orders_version: int | None = None,
+) -> tuple[list[dict[str, Any]], str | None] | None:
+    """See order_service.list_orders_by_user."""
+    if user_id != current_user_id:
+        return None
+    digest = list_page_digest(
+        limit, cursor, fields, status, created_from, created_to
+    )
+    if orders_version is None:
+        orders_version = await get_list_version(db, user_id)
+    cached = await cache.cache_user_orders_get(user_id, orders_version, digest)
+    if cached is not None:
+        return cached["items"], cached["next_cursor"]
+    items, next_cursor = await db.run_sync(
+        query_orders_page,
+        user_id,
+        limit,
+        cursor,
+        fields,
+        status,
+        created_from,
+        created_to,
+    )
+    await cache.cache_user_orders_set(
+        user_id,
+        orders_version,
+        digest,
+        {"items": items, "next_cursor": next_cursor},
+    )
+    return items, next_cursor
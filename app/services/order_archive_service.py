@@ -0,0 +1,88 @@
+"""Archive tier: move old closed orders out of the hot orders table.
+
+SHIPPED and CANCELED orders older than ORDER_ARCHIVE_AFTER_DAYS are
+moved to orders_archive in batches. Reads in order_service fall back to
+the archive, so archived orders stay visible through the API; rollups
+and cached entries are unaffected because the order data does not change.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import Order, OrderStatus
+from app.models.order_archive import OrderArchive
+
+# Statuses of orders that are moved to the archive
+ARCHIVED_STATUSES = (OrderStatus.SHIPPED, OrderStatus.CANCELED)
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "items",
+    "total_price",
+    "status",
+    "created_at",
+    "version",
+)
+
+
+def archive_cutoff(now: datetime | None = None) -> datetime:
+    """
+    Return the creation time before which closed orders are archived.
+    Every archived order was created before it.
+    """
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS)
+
+
+def archive_closed_orders(
+    db: Session, before: datetime, batch_size: int = 1000
+) -> int:
+    """
+    Move SHIPPED and CANCELED orders created before `before` to
+    orders_archive, oldest first, batch_size orders per transaction
+    (copy then delete). Return the number of orders moved.
+
+    Rows of a batch are locked (SKIP LOCKED on Postgres), so a
+    concurrent status update either commits first and is archived with
+    its new status, or waits and then finds the order in the archive.
+    """
+    moved = 0
+    while True:
+        ids = list(
+            db.scalars(
+                select(Order.id)
+                .where(
+                    Order.status.in_(ARCHIVED_STATUSES),
+                    Order.created_at < before,
+                )
+                .order_by(Order.created_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        if not ids:
+            break
+        archived_at = literal(
+            datetime.now(timezone.utc), OrderArchive.archived_at.type
+        )
+        db.execute(
+            insert(OrderArchive).from_select(
+                [*_ARCHIVED_COLUMNS, "archived_at"],
+                select(
+                    *(getattr(Order, c) for c in _ARCHIVED_COLUMNS),
+                    archived_at,
+                ).where(Order.id.in_(ids)),
+            )
+        )
+        db.execute(
+            delete(Order)
+            .where(Order.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        moved += len(ids)
+    return moved
@@ -0,0 +1,117 @@
+"""Monthly range partitions of the orders table (Postgres).
+
+Migration 008 partitions orders by created_at, one partition per UTC
+month named orders_pYYYY_MM. These helpers create partitions ahead of
+time and detach old ones; detached partitions are left as standalone
+tables so they can be archived or dropped separately.
+"""
+
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARTITION_NAME_RE = re.compile(r"^orders_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date | datetime) -> date:
+    """Return the first day of value's month."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    """Return the first day of the month n months after month."""
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding month."""
+    return f"orders_p{month:%Y_%m}"
+
+
+def is_orders_partitioned(db: Session) -> bool:
+    """Return True if orders is a partitioned table (Postgres only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass('orders')"
+            )
+        ).scalar()
+    )
+
+
+def list_order_partitions(db: Session) -> list[tuple[str, date]]:
+    """Return (name, month) of the attached monthly partitions, oldest first."""
+    names = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('orders')"
+        )
+    ).scalars()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            year, month = int(match[1]), int(match[2])
+            partitions.append((name, date(year, month, 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def create_order_partitions(
+    db: Session, first: date, months: int, dry_run: bool = False
+) -> list[str]:
+    """
+    Create the missing partitions for `months` months starting at
+    first's month. Return the names of the partitions created.
+    """
+    existing = {name for name, _ in list_order_partitions(db)}
+    created = []
+    month = month_start(first)
+    for _ in range(months):
+        upper = add_months(month, 1)
+        name = partition_name(month)
+        if name not in existing:
+            if not dry_run:
+                db.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF orders "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+                        f"TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+                    )
+                )
+            created.append(name)
+        month = upper
+    if not dry_run:
+        db.commit()
+    return created
+
+
+def detach_order_partitions(
+    db: Session, before: date, dry_run: bool = False
+) -> list[str]:
+    """
+    Detach the partitions of months before before's month. Return the
+    names of the partitions detached.
+    """
+    cutoff = month_start(before)
+    detached = []
+    for name, month in list_order_partitions(db):
+        if month >= cutoff:
+            break
+        if not dry_run:
+            db.execute(text(f"ALTER TABLE orders DETACH PARTITION {name}"))
+        detached.append(name)
+    if not dry_run:
+        db.commit()
+    return detached
+
+
+def current_month() -> date:
+    """Return the first day of the current UTC month."""
+    return month_start(datetime.now(timezone.utc))
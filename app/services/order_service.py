@@ -1,106 +1,752 @@
 """Order service: create, get by id (cache-first), update status, list by user."""
 
-from datetime import datetime
+import heapq
+import json
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    case,
+    exists,
+    func,
+    insert,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, aliased, defer
 
-from app.core.events import publish_new_order
+from app.core.config import settings
+from app.core.etag import short_digest
+from app.core.events import publish_new_order, publish_new_orders
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.redis_client import (
+    acquire_order_fill_lock,
+    cache_order_clear_missing,
     cache_order_delete,
-    cache_order_get,
+    cache_order_get_many,
+    cache_order_is_missing,
+    cache_order_lookup,
+    cache_order_poll_fill,
     cache_order_set,
+    cache_order_set_many,
+    cache_order_set_missing,
+    cache_order_write_through,
+    cache_user_orders_get,
+    cache_user_orders_set,
+    cache_user_orders_version_get,
+    cache_user_orders_version_set,
+    mark_recent_write,
+    release_order_fill_lock,
 )
+from app.core.single_flight import SingleFlight, should_refresh_early
 from app.models.order import Order
+from app.models.order_archive import OrderArchive
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.services.order_archive_service import archive_cutoff
+from app.services.order_summary_service import (
+    get_orders_version,
+    pop_orders_versions,
+    record_order_created,
+    record_orders_created,
+    record_status_change,
+)
+
+
+# Fields that can be requested through the ?fields= sparse fieldset.
+ORDER_FIELDS = (
+    "id",
+    "user_id",
+    "items",
+    "total_price",
+    "status",
+    "created_at",
+    "version",
+)
+
+
+def parse_order_fields(fields: str | None) -> frozenset[str] | None:
+    """
+    Parse a comma-separated ?fields= value into a set of field names.
+    Return None when no projection is requested.
+    Raise ValueError on an empty list or unknown field names.
+    """
+    if fields is None:
+        return None
+    requested = frozenset(f.strip() for f in fields.split(",") if f.strip())
+    if not requested or not requested <= set(ORDER_FIELDS):
+        raise ValueError("Invalid fields")
+    return requested
+
+
+# Scalar fields stored in the cache head.
+_HEAD_FIELDS = frozenset(ORDER_FIELDS) - {"items"}
 
+# A hot or archived order row; both have the same order columns.
+OrderRow = Order | OrderArchive
 
-def _order_to_dict(order: Order) -> dict[str, Any]:
-    """Serialize Order to a dict for cache and API (created_at as ISO string)."""
+# Coalesces concurrent cache-miss loads of the same order in this worker.
+_order_loads = SingleFlight()
+
+
+def is_valid_order_id(order_id: str) -> bool:
+    """
+    Return True if order_id is a canonical lowercase UUID string, the
+    only form order ids are stored in. Anything else cannot exist.
+    """
+    try:
+        return str(uuid.UUID(order_id)) == order_id
+    except ValueError:
+        return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return value as an aware UTC datetime (SQLite returns naive)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _wants_items(fields: frozenset[str] | None) -> bool:
+    """Return True if the projection includes the items column."""
+    return fields is None or "items" in fields
+
+
+def project_order(
+    data: dict[str, Any], fields: frozenset[str] | None
+) -> dict[str, Any]:
+    """Keep only the requested fields of an order dict (all if None)."""
+    if fields is None:
+        return data
+    return {k: v for k, v in data.items() if k in fields}
+
+
+def _order_to_dict(order: OrderRow, with_items: bool = True) -> dict[str, Any]:
+    """
+    Serialize an order row to a dict for cache and API (created_at as ISO string).
+    With with_items=False the (possibly deferred) items column is not
+    touched, so no extra load is triggered.
+    """
     created = order.created_at
     if isinstance(created, datetime):
         created_str = created.isoformat()
     else:
         created_str = str(created) if created else None
-    return {
+    data = {
         "id": order.id,
         "user_id": order.user_id,
-        "items": order.items or [],
         "total_price": order.total_price,
         "status": str(order.status) if order.status else "PENDING",
         "created_at": created_str,
+        "version": order.version,
     }
+    if with_items:
+        data["items"] = order.items or []
+    return data
 
 
-def create_order(db: Session, user_id: int, data: OrderCreate) -> Order:
+def insert_order(
+    db: Session, user_id: int, data: OrderCreate
+) -> dict[str, Any]:
     """
-    Create an order, publish new_order event, return the created order.
+    DB part of create_order: INSERT ... RETURNING the order and update
+    the user's rollup in one transaction; return the committed order as
+    a dict. No reload after commit: RETURNING already has every column.
     """
-    order = Order(
-        user_id=user_id,
-        items=data.items,
-        total_price=data.total_price,
-        status="PENDING",
+    order = db.scalar(
+        insert(Order)
+        .values(
+            user_id=user_id,
+            items=data.items,
+            total_price=data.total_price,
+            status="PENDING",
+        )
+        .returning(Order)
     )
-    db.add(order)
+    record_order_created(db, order)
+    created = _order_to_dict(order)
     db.commit()
-    db.refresh(order)
-    publish_new_order(order_id=order.id, user_id=order.user_id)
+    return created
+
+
+def cache_list_versions(db: Session) -> None:
+    """
+    Cache the orders_version values just committed by the session. List
+    ETags and cached pages are keyed by the cached value, so the new
+    version takes effect for them at once.
+    """
+    for user_id, version in pop_orders_versions(db).items():
+        cache_user_orders_version_set(user_id, version)
+
+
+def get_list_version(db: Session, user_id: int) -> int:
+    """
+    Return the user's orders_version for list ETags and cached pages:
+    the cached value, or on a miss the DB value (which is then cached).
+    Both come from this one value, so a cached page is only ever sent
+    under the ETag of the version it was cached for.
+    """
+    version = cache_user_orders_version_get(user_id)
+    if version is None:
+        version = get_orders_version(db, user_id)
+        cache_user_orders_version_set(user_id, version)
+    return version
+
+
+def create_order(
+    db: Session, user_id: int, data: OrderCreate
+) -> dict[str, Any]:
+    """
+    Create an order, update the user's rollup in the same transaction,
+    cache the user's new orders_version (moving list pages and ETags to
+    it), pin the user's reads to the
+    primary for a moment, publish new_order event, return the created
+    order as a dict. With CACHE_WRITE_MODE=write_through the
+    new order is also cached right away.
+    """
+    order = insert_order(db, user_id, data)
+    mark_recent_write(user_id)
+    cache_order_clear_missing(order["id"])
+    if settings.CACHE_WRITE_MODE == "write_through":
+        cache_order_set(order["id"], order)
+    cache_list_versions(db)
+    publish_new_order(order_id=order["id"], user_id=user_id)
     return order
 
 
+def create_orders_bulk(
+    db: Session, user_id: int, data: list[OrderCreate]
+) -> list[dict[str, Any]]:
+    """
+    Create many orders in one transaction: a single multi-row
+    INSERT ... RETURNING and one rollup upsert. Then drop any negative
+    cache entries for the new ids, move the user's list pages to the
+    new orders_version once and publish all new_order events over one
+    channel. Return the created orders as dicts, in input order.
+    """
+    orders = list(
+        db.scalars(
+            insert(Order).returning(Order, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": user_id,
+                    "items": item.items,
+                    "total_price": item.total_price,
+                    "status": "PENDING",
+                }
+                for item in data
+            ],
+        )
+    )
+    record_orders_created(db, orders)
+    # Serialise before commit: RETURNING already loaded every column
+    created = [_order_to_dict(order) for order in orders]
+    db.commit()
+    mark_recent_write(user_id)
+    for order in created:
+        cache_order_clear_missing(order["id"])
+    if settings.CACHE_WRITE_MODE == "write_through":
+        cache_order_set_many(created)
+    cache_list_versions(db)
+    publish_new_orders([(order["id"], user_id) for order in created])
+    return created
+
+
+def _load_order(
+    db: Session, order_id: str, with_items: bool
+) -> dict[str, Any] | None:
+    """
+    Load an order from the DB and fill the cache, or return None if it
+    does not exist. Across workers only the holder of the Redis fill lock
+    queries the DB; the others poll until it has cached the projection
+    they need or marked the order missing. If the lock is released (or
+    expires) without either, e.g. the holder failed or filled only the
+    head, they query the DB themselves.
+    """
+    token = acquire_order_fill_lock(order_id)
+    if token is None:
+        deadline = time.monotonic() + settings.ORDER_FILL_LOCK_TTL
+        while time.monotonic() < deadline:
+            time.sleep(settings.ORDER_FILL_POLL_INTERVAL)
+            cached, missing, locked = cache_order_poll_fill(
+                order_id, with_items
+            )
+            if _is_complete(cached, with_items):
+                return cached
+            if missing:
+                return None
+            if not locked:
+                break
+    return _query_and_fill(db, order_id, with_items, token)
+
+
+def _is_complete(cached: dict[str, Any] | None, with_items: bool) -> bool:
+    """Return True if a cached order has every field a read needs."""
+    return (
+        cached is not None
+        and _HEAD_FIELDS <= cached.keys()
+        and (not with_items or "items" in cached)
+    )
+
+
+def query_order(
+    db: Session, order_id: str, with_items: bool
+) -> tuple[dict[str, Any] | None, float]:
+    """
+    Query one order (items deferred unless with_items), falling back to
+    the archive; return its dict (None if missing) and the seconds the
+    query took.
+    """
+    started = time.perf_counter()
+    query = db.query(Order).filter(Order.id == order_id)
+    if not with_items:
+        query = query.options(defer(Order.items))
+    order = query.first()
+    if order is None:
+        archived = db.query(OrderArchive).filter(OrderArchive.id == order_id)
+        if not with_items:
+            archived = archived.options(defer(OrderArchive.items))
+        order = archived.first()
+    elapsed = time.perf_counter() - started
+    if order is None:
+        return None, elapsed
+    return _order_to_dict(order, with_items=with_items), elapsed
+
+
+def _query_and_fill(
+    db: Session, order_id: str, with_items: bool, token: str | None
+) -> dict[str, Any] | None:
+    """Query one order, write it to the cache and release the fill lock."""
+    try:
+        data, elapsed = query_order(db, order_id, with_items)
+        if data is None:
+            cache_order_set_missing(order_id)
+            return None
+        cache_order_set(order_id, data, compute_time=elapsed)
+        return data
+    finally:
+        if token:
+            release_order_fill_lock(order_id, token)
+
+
+def _refresh_order_early(db: Session, order_id: str, with_items: bool) -> None:
+    """Reload a cached order before it expires if no one else is."""
+    token = acquire_order_fill_lock(order_id)
+    if token:
+        _query_and_fill(db, order_id, with_items, token)
+
+
 def get_order_by_id(
-    db: Session, order_id: str, current_user_id: int
+    db: Session,
+    order_id: str,
+    current_user_id: int,
+    fields: frozenset[str] | None = None,
 ) -> dict[str, Any] | None:
     """
-    Get order by id: cache-first (Redis then DB). Set cache on DB read.
-    Return order dict only if order belongs to current_user_id; else None (404).
+    Get order by id: cache-first (Redis then DB, then the archive). Set
+    cache on DB read.
+    When fields excludes items, items is neither read from Redis nor
+    loaded from the DB. The result is not projected (see project_order);
+    it always carries version for ETags. Return the order dict only if
+    order belongs to current_user_id; else None (404).
+
+    Cache misses are single-flighted: one DB query per order per expiry,
+    in-process via SingleFlight and across workers via a Redis lock.
+    With ORDER_EARLY_REFRESH_BETA > 0, a hit close to expiry may reload
+    the entry early (only by the caller that wins the fill lock).
+    Ids that are malformed or recently not found (negative cache) return
+    None without a DB query; foreign orders are cached like any other.
     """
-    # Try cache first
-    cached = cache_order_get(order_id)
-    if cached is not None:
+    if not is_valid_order_id(order_id):
+        return None
+    with_items = _wants_items(fields)
+    # Try cache first; entries written before a field existed are misses
+    cached, ttl, delta = cache_order_lookup(order_id, with_items)
+    if cached is not None and _HEAD_FIELDS <= cached.keys():
         if cached.get("user_id") != current_user_id:
             return None
+        if ttl is not None and should_refresh_early(
+            ttl, delta, settings.ORDER_EARLY_REFRESH_BETA
+        ):
+            _refresh_order_early(db, order_id, with_items)
         return cached
-    # DB
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if order is None or order.user_id != current_user_id:
+    if cache_order_is_missing(order_id):
+        return None
+    # DB, at most one concurrent load per order and projection
+    data = _order_loads.do(
+        (order_id, with_items),
+        lambda: _load_order(db, order_id, with_items),
+    )
+    if data is None or data.get("user_id") != current_user_id:
         return None
-    data = _order_to_dict(order)
-    cache_order_set(order_id, data)
     return data
 
 
-def update_order_status(
+def get_orders_by_ids(
+    db: Session, order_ids: list[str], current_user_id: int
+) -> list[dict[str, Any]]:
+    """
+    Get many orders by id: one pipelined cache read, one
+    WHERE id IN (...) query for the misses (plus one on the archive for
+    ids not in orders), and one pipelined cache fill.
+    Return the orders owned by current_user_id in request order
+    (duplicates collapsed); malformed, missing and foreign ids are left
+    out, as get_order_by_id would 404 them.
+    """
+    unique_ids = [
+        order_id
+        for order_id in dict.fromkeys(order_ids)
+        if is_valid_order_id(order_id)
+    ]
+    # Entries missing head fields (e.g. from an older schema) are misses
+    found = {
+        order_id: cached
+        for order_id, cached in cache_order_get_many(unique_ids).items()
+        if _is_complete(cached, with_items=True)
+    }
+    misses = [order_id for order_id in unique_ids if order_id not in found]
+    if misses:
+        loaded = [
+            _order_to_dict(order)
+            for order in db.query(Order).filter(Order.id.in_(misses))
+        ]
+        if len(loaded) < len(misses):
+            hot = {data["id"] for data in loaded}
+            loaded.extend(
+                _order_to_dict(order)
+                for order in db.query(OrderArchive).filter(
+                    OrderArchive.id.in_(set(misses) - hot)
+                )
+            )
+        cache_order_set_many(loaded)
+        found.update((data["id"], data) for data in loaded)
+    return [
+        found[order_id]
+        for order_id in unique_ids
+        if order_id in found
+        and found[order_id].get("user_id") == current_user_id
+    ]
+
+
+def _update_status_returning(
+    db: Session,
+    model: type[OrderRow],
+    order_id: str,
+    current_user_id: int,
+    new_status: str,
+) -> tuple[OrderRow, str] | None:
+    """
+    Set the status of an owned order and return (updated order, previous
+    status), or None if no row matched. The version is bumped only if
+    the status changes.
+
+    On Postgres this is one UPDATE ... FROM (SELECT ... FOR UPDATE) ...
+    RETURNING statement; the locking subselect makes concurrent updates
+    read each other's committed status, so rollup deltas stay exact.
+    SQLite's RETURNING cannot read the joined subselect, so there the
+    previous status is selected first.
+    """
+    version = case(
+        (model.status != new_status, model.version + 1),
+        else_=model.version,
+    )
+    if db.get_bind().dialect.name != "postgresql":
+        previous_status = db.scalar(
+            select(model.status).where(
+                model.id == order_id, model.user_id == current_user_id
+            )
+        )
+        if previous_status is None:
+            return None
+        order = db.scalar(
+            update(model)
+            .where(model.id == order_id)
+            .values(status=new_status, version=version)
+            .returning(model)
+            .execution_options(synchronize_session=False)
+        )
+        return order, previous_status
+    old = aliased(model)
+    previous = (
+        select(old.id, old.status)
+        .where(old.id == order_id, old.user_id == current_user_id)
+        .with_for_update()
+        .subquery()
+    )
+    row = db.execute(
+        update(model)
+        .where(model.id == previous.c.id)
+        .values(status=new_status, version=version)
+        .returning(model, previous.c.status.label("previous_status"))
+        .execution_options(synchronize_session=False)
+    ).first()
+    return (row[0], row[1]) if row is not None else None
+
+
+def apply_status_update(
     db: Session, order_id: str, current_user_id: int, data: OrderUpdate
-) -> Order | None:
+) -> dict[str, Any] | None:
     """
-    Update order status only if order belongs to current user. Invalidate cache.
-    Return updated Order or None (404).
+    DB part of update_order_status: one UPDATE ... RETURNING changes the
+    status of the order if current_user_id owns it and bumps its
+    version, then the rollup is updated and the transaction committed.
+    Archived orders are updated in place in the archive. Return the
+    order as a dict, or None if it is missing or not owned by
+    current_user_id.
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
-    if order is None or order.user_id != current_user_id:
+    if data.status is None:
+        order, _ = query_order(db, order_id, with_items=True)
+        if order is None or order["user_id"] != current_user_id:
+            return None
+        return order
+    for model in (Order, OrderArchive):
+        updated = _update_status_returning(
+            db, model, order_id, current_user_id, data.status
+        )
+        if updated is not None:
+            break
+    else:
+        db.rollback()
         return None
-    if data.status is not None:
-        order.status = data.status
+    order, old_status = updated
+    record_status_change(
+        db, order.user_id, order.total_price, old_status, data.status
+    )
+    result = _order_to_dict(order)
     db.commit()
-    db.refresh(order)
-    cache_order_delete(order_id)
+    return result
+
+
+def update_order_status(
+    db: Session, order_id: str, current_user_id: int, data: OrderUpdate
+) -> dict[str, Any] | None:
+    """
+    Update order status only if order belongs to current user. Bump the
+    order version and update the user's rollup in the same transaction.
+    Invalidate (or, with CACHE_WRITE_MODE=write_through, overwrite) the
+    order cache and cache the user's new orders_version for list pages.
+    Return the updated order dict or None (404).
+    """
+    order = apply_status_update(db, order_id, current_user_id, data)
+    if order is None:
+        return None
+    mark_recent_write(current_user_id)
+    if settings.CACHE_WRITE_MODE == "write_through":
+        cache_order_write_through(order_id, order)
+    else:
+        cache_order_delete(order_id)
+    cache_list_versions(db)
     return order
 
 
+def list_page_digest(
+    limit: int,
+    cursor: str | None,
+    fields: frozenset[str] | None,
+    status: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    sku: str | None = None,
+) -> str:
+    """Return the digest identifying a list page in the page cache."""
+    params = {
+        "limit": limit,
+        "cursor": cursor,
+        "fields": ",".join(sorted(fields)) if fields else None,
+        "status": status,
+        "created_from": created_from.isoformat() if created_from else None,
+        "created_to": created_to.isoformat() if created_to else None,
+    }
+    if sku is not None:
+        params["sku"] = sku
+    return short_digest(f"{k}={v}" for k, v in params.items())
+
+
+def items_contain_sku(
+    db: Session, sku: str, model: type[OrderRow] = Order
+) -> ColumnElement[bool]:
+    """
+    Return a filter matching orders (of model: Order or OrderArchive)
+    with an item whose "sku" equals sku: JSONB containment (@>, served by
+    the GIN index of orders) on Postgres, a json_each scan elsewhere
+    (SQLite).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return type_coerce(model.items, JSONB).contains([{"sku": sku}])
+    item = func.json_each(model.items).table_valued("value")
+    return exists(
+        select(1)
+        .select_from(item)
+        .where(func.json_extract(item.c.value, "$.sku") == sku)
+    )
+
+
+def query_orders_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    fields: frozenset[str] | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    sku: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    DB part of list_orders_by_user: query one keyset page and return
+    (projected order dicts, next_cursor). Raise ValueError if cursor is
+    malformed.
+
+    The archive is only queried, and its rows merged in, when the page
+    may reach orders older than the archive cutoff: archived orders are
+    all older than that, so a full page of newer hot orders needs none.
+    """
+    with_items = _wants_items(fields)
+    position = decode_cursor(cursor) if cursor is not None else None
+
+    def _page(model: type[OrderRow]) -> list[OrderRow]:
+        query = db.query(model).filter(model.user_id == user_id)
+        if status is not None:
+            query = query.filter(model.status == status)
+        if sku is not None:
+            query = query.filter(items_contain_sku(db, sku, model))
+        if created_from is not None:
+            query = query.filter(model.created_at >= created_from)
+        if created_to is not None:
+            query = query.filter(model.created_at < created_to)
+        if not with_items:
+            query = query.options(defer(model.items))
+        if position is not None:
+            created_at, order_id = position
+            # The row comparison alone does not prune partitions; the
+            # redundant bound on created_at does
+            query = query.filter(
+                tuple_(model.created_at, model.id) < (created_at, order_id),
+                model.created_at <= created_at,
+            )
+        # Fetch one extra row to know whether another page exists
+        return (
+            query.order_by(model.created_at.desc(), model.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+    orders = _page(Order)
+    cutoff = archive_cutoff()
+    if (created_from is None or _as_utc(created_from) < cutoff) and (
+        len(orders) <= limit or _as_utc(orders[-1].created_at) < cutoff
+    ):
+        orders = sorted(
+            [*orders, *_page(OrderArchive)],
+            key=lambda o: (o.created_at, o.id),
+            reverse=True,
+        )[: limit + 1]
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    items = [
+        project_order(_order_to_dict(o, with_items=with_items), fields)
+        for o in orders
+    ]
+    return items, next_cursor
+
+
 def list_orders_by_user(
-    db: Session, user_id: int, current_user_id: int
-) -> list[Order] | None:
+    db: Session,
+    user_id: int,
+    current_user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    fields: frozenset[str] | None = None,
+    status: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    sku: str | None = None,
+    orders_version: int | None = None,
+) -> tuple[list[dict[str, Any]], str | None] | None:
     """
-    List orders for user_id. Return list only if user_id == current_user_id;
-    else return None (403).
+    List one page of orders for user_id, newest first, using keyset
+    pagination on (created_at, id) so every page costs the same index
+    range scan. Optional status, created_at range
+    (created_from <= created_at < created_to) and item SKU filters are
+    applied in SQL. Archived orders are merged in where the page reaches
+    their age.
+    The items column is deferred unless fields requests it.
+    Pages are cached in Redis under the user's orders_version, which
+    every order write bumps: orders_version if the caller already read
+    it for the ETag, else get_list_version.
+    Return (order dicts, next_cursor) only if user_id == current_user_id;
+    else return None (403). next_cursor is None on the last page.
+    Raise ValueError if cursor is malformed.
     """
     if user_id != current_user_id:
         return None
-    orders = (
-        db.query(Order)
-        .filter(Order.user_id == user_id)
-        .order_by(Order.created_at.desc())
+    digest = list_page_digest(
+        limit, cursor, fields, status, created_from, created_to, sku
+    )
+    if orders_version is None:
+        orders_version = get_list_version(db, user_id)
+    cached = cache_user_orders_get(user_id, orders_version, digest)
+    if cached is not None:
+        return cached["items"], cached["next_cursor"]
+    items, next_cursor = query_orders_page(
+        db,
+        user_id,
+        limit,
+        cursor,
+        fields,
+        status,
+        created_from,
+        created_to,
+        sku,
     )
-    return list(orders)
+    cache_user_orders_set(
+        user_id,
+        orders_version,
+        digest,
+        {"items": items, "next_cursor": next_cursor},
+    )
+    return items, next_cursor
+
+
+def export_orders_by_user(
+    db: Session, user_id: int, current_user_id: int
+) -> Iterator[str] | None:
+    """
+    Stream all orders for user_id, archived ones included, as NDJSON
+    lines, newest first.
+    Rows are read through a server-side cursor in batches of
+    ORDERS_EXPORT_BATCH_SIZE, so memory stays flat regardless of how many
+    orders the user has. Return None if user_id != current_user_id (403).
+    """
+    if user_id != current_user_id:
+        return None
+
+    def _rows(model: type[OrderRow]) -> Iterator[OrderRow]:
+        return db.scalars(
+            select(model)
+            .where(model.user_id == user_id)
+            .order_by(model.created_at.desc(), model.id.desc())
+            .execution_options(yield_per=settings.ORDERS_EXPORT_BATCH_SIZE)
+        )
+
+    def _lines() -> Iterator[str]:
+        for order in heapq.merge(
+            _rows(Order),
+            _rows(OrderArchive),
+            key=lambda o: (o.created_at, o.id),
+            reverse=True,
+        ):
+            yield json.dumps(_order_to_dict(order)) + "\n"
+            # Detach streamed rows so the identity map does not grow
+            db.expunge(order)
+
+    return _lines()
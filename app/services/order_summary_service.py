@@ -0,0 +1,266 @@
+"""Per-user order summary: incremental rollup maintenance and backfill."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import case, event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderStatus
+from app.models.order_archive import OrderArchive
+from app.models.order_summary import UserOrderSummary
+from app.models.user import User
+
+# Rollup counter column for each order status.
+STATUS_COUNT_COLUMNS = {
+    OrderStatus.PENDING: "pending_count",
+    OrderStatus.PAID: "paid_count",
+    OrderStatus.SHIPPED: "shipped_count",
+    OrderStatus.CANCELED: "canceled_count",
+}
+
+_summary_table = UserOrderSummary.__table__
+
+# Session.info key of {user_id: orders_version} written by _apply_delta
+_ORDERS_VERSIONS = "orders_versions"
+
+
+def _dialect_insert(db: Session) -> Any:
+    """Return the insert() of the session's dialect (for ON CONFLICT)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+def _apply_delta(
+    db: Session,
+    user_id: int,
+    deltas: dict[str, float],
+    last_order_at: datetime | None = None,
+) -> None:
+    """
+    Atomically add deltas to a user's rollup row, creating it if missing
+    (INSERT ... ON CONFLICT DO UPDATE). Also bumps orders_version and
+    notes the new value on the session (see pop_orders_versions).
+    Runs in the caller's transaction.
+    """
+    insert = _dialect_insert(db)
+    values: dict[str, Any] = {col: 0 for col in STATUS_COUNT_COLUMNS.values()}
+    values["total_spend"] = 0.0
+    deltas = {**deltas, "orders_version": 1}
+    values.update(deltas)
+    values["last_order_at"] = last_order_at
+    stmt = insert(_summary_table).values(user_id=user_id, **values)
+    current = _summary_table.c
+    set_: dict[str, Any] = {
+        col: current[col] + stmt.excluded[col] for col in deltas
+    }
+    if last_order_at is not None:
+        set_["last_order_at"] = case(
+            (
+                current.last_order_at.is_(None)
+                | (stmt.excluded.last_order_at > current.last_order_at),
+                stmt.excluded.last_order_at,
+            ),
+            else_=current.last_order_at,
+        )
+    version = db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[current.user_id], set_=set_
+        ).returning(current.orders_version)
+    )
+    db.info.setdefault(_ORDERS_VERSIONS, {})[user_id] = version
+
+
+def pop_orders_versions(db: Session) -> dict[int, int]:
+    """
+    Return {user_id: orders_version} of the rollups updated by the
+    session since the last call; call after commit, so cached list
+    versions only ever name committed data.
+    """
+    return db.info.pop(_ORDERS_VERSIONS, {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_orders_versions(session: Session) -> None:
+    """Drop orders_versions noted in a rolled back transaction."""
+    session.info.pop(_ORDERS_VERSIONS, None)
+
+
+def record_order_created(db: Session, order: Order) -> None:
+    """Add a newly created (flushed) order to its user's rollup."""
+    record_orders_created(db, [order])
+
+
+def record_orders_created(db: Session, orders: list[Order]) -> None:
+    """
+    Add newly created (flushed) orders to their users' rollups, with one
+    upsert per user.
+    """
+    by_user: dict[int, list[Order]] = {}
+    for order in orders:
+        by_user.setdefault(order.user_id, []).append(order)
+    for user_id, user_orders in by_user.items():
+        deltas: dict[str, float] = {}
+        for order in user_orders:
+            column = STATUS_COUNT_COLUMNS[order.status]
+            deltas[column] = deltas.get(column, 0) + 1
+            if order.status != OrderStatus.CANCELED:
+                deltas["total_spend"] = (
+                    deltas.get("total_spend", 0.0) + order.total_price
+                )
+        _apply_delta(
+            db,
+            user_id,
+            deltas,
+            last_order_at=max(order.created_at for order in user_orders),
+        )
+
+
+def record_status_change(
+    db: Session,
+    user_id: int,
+    total_price: float,
+    old_status: str,
+    new_status: str,
+) -> None:
+    """
+    Move an order (of user_id, worth total_price) between status
+    counters in its user's rollup.
+    """
+    if old_status == new_status:
+        return
+    deltas: dict[str, float] = {
+        STATUS_COUNT_COLUMNS[old_status]: -1,
+        STATUS_COUNT_COLUMNS[new_status]: 1,
+    }
+    if new_status == OrderStatus.CANCELED:
+        deltas["total_spend"] = -total_price
+    elif old_status == OrderStatus.CANCELED:
+        deltas["total_spend"] = total_price
+    _apply_delta(db, user_id, deltas)
+
+
+def get_user_summary(
+    db: Session, user_id: int, current_user_id: int
+) -> dict[str, Any] | None:
+    """
+    Return the rollup for user_id as a dict (zeros if the user has no
+    orders). Return None if user_id != current_user_id (403).
+    """
+    if user_id != current_user_id:
+        return None
+    summary = db.get(UserOrderSummary, user_id)
+    counts = {
+        status: getattr(summary, col) if summary else 0
+        for status, col in STATUS_COUNT_COLUMNS.items()
+    }
+    return {
+        "user_id": user_id,
+        "counts": counts,
+        "total_spend": summary.total_spend if summary else 0.0,
+        "last_order_at": summary.last_order_at if summary else None,
+    }
+
+
+def get_orders_version(db: Session, user_id: int) -> int:
+    """Return the user's orders_version (0 if the user has no rollup)."""
+    version = db.scalar(
+        select(UserOrderSummary.orders_version).where(
+            UserOrderSummary.user_id == user_id
+        )
+    )
+    return version or 0
+
+
+def rebuild_user_summaries(db: Session, batch_size: int = 500) -> int:
+    """
+    Recompute rollups from orders and orders_archive, batch_size users per
+    transaction. Return the number of users processed.
+
+    Every user of a batch first gets a rollup row if missing, and all
+    those rows are locked before aggregating, so concurrent writers
+    either commit before the aggregate sees their order, or apply their
+    delta after the rebuilt row is committed. Rows are then overwritten
+    in place (INSERT ... ON CONFLICT DO UPDATE), never deleted, and get a
+    new orders_version, noted on the session like _apply_delta does.
+    """
+    insert = _dialect_insert(db)
+    current = _summary_table.c
+    processed = 0
+    last_user_id = 0
+    while True:
+        user_ids = list(
+            db.scalars(
+                select(User.id)
+                .where(User.id > last_user_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+        )
+        if not user_ids:
+            break
+        db.execute(
+            insert(_summary_table)
+            .values([{"user_id": user_id} for user_id in user_ids])
+            .on_conflict_do_nothing(index_elements=[current.user_id])
+        )
+        db.execute(
+            select(current.user_id)
+            .where(current.user_id.in_(user_ids))
+            .with_for_update()
+        ).all()
+        rows = [
+            row
+            for model in (Order, OrderArchive)
+            for row in db.execute(
+                select(
+                    model.user_id,
+                    model.status,
+                    func.count(),
+                    func.sum(model.total_price),
+                    func.max(model.created_at),
+                )
+                .where(model.user_id.in_(user_ids))
+                .group_by(model.user_id, model.status)
+            )
+        ]
+        summaries: dict[int, dict[str, Any]] = {
+            user_id: {
+                "user_id": user_id,
+                **{col: 0 for col in STATUS_COUNT_COLUMNS.values()},
+                "total_spend": 0.0,
+                "last_order_at": None,
+            }
+            for user_id in user_ids
+        }
+        for user_id, order_status, count, total, last_at in rows:
+            summary = summaries[user_id]
+            summary[STATUS_COUNT_COLUMNS[order_status]] += count
+            if order_status != OrderStatus.CANCELED:
+                summary["total_spend"] += total or 0.0
+            if summary["last_order_at"] is None or (
+                last_at is not None and last_at > summary["last_order_at"]
+            ):
+                summary["last_order_at"] = last_at
+        stmt = insert(_summary_table).values(list(summaries.values()))
+        set_: dict[str, Any] = {
+            col: stmt.excluded[col]
+            for col in (
+                *STATUS_COUNT_COLUMNS.values(),
+                "total_spend",
+                "last_order_at",
+            )
+        }
+        set_["orders_version"] = current.orders_version + 1
+        versions = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[current.user_id], set_=set_
+            ).returning(current.user_id, current.orders_version)
+        ).all()
+        db.commit()
+        db.info.setdefault(_ORDERS_VERSIONS, {}).update(versions)
+        processed += len(user_ids)
+        last_user_id = user_ids[-1]
+    return processed
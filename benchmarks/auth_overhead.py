@@ -0,0 +1,60 @@
+"""Benchmark per-request token verification with and without the cache.
+
+Compares jwt.decode on every request (as before the verified token
+cache) against decode_access_token serving a client's reused token from
+the cache, and the full Bearer check of protected routes
+(_token_user_id) on top of the cache.
+
+Run from the repository root:
+
+    python -m benchmarks.auth_overhead [--number 50000]
+"""
+
+import argparse
+import timeit
+
+import jwt
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.config import settings
+from app.core.security import (
+    _token_user_id,
+    create_access_token,
+    decode_access_token,
+)
+
+
+def uncached_decode(token: str) -> dict:
+    """Verify and parse the token as decode_access_token did before."""
+    return jwt.decode(
+        token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+    )
+
+
+def main() -> None:
+    """Print µs per call for each path and the speedup of the cache."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=50000)
+    args = parser.parse_args()
+    token = create_access_token(42)
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=token
+    )
+    decode_access_token(token)
+    paths = {
+        "jwt.decode": lambda: uncached_decode(token),
+        "cached decode": lambda: decode_access_token(token),
+        "cached bearer check": lambda: _token_user_id(credentials),
+    }
+    timings = {
+        name: timeit.timeit(fn, number=args.number) / args.number * 1e6
+        for name, fn in paths.items()
+    }
+    for name, us in timings.items():
+        print(f"{name:<22}{us:>8.2f} µs")
+    speedup = timings["jwt.decode"] / timings["cached decode"]
+    print(f"{'speedup':<22}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
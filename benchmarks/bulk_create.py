@@ -0,0 +1,62 @@
+"""Benchmark sequential create_order calls against create_orders_bulk.
+
+Both paths run the real service code on a throwaway SQLite database,
+including cache invalidation and new_order publishing against the
+configured Redis and RabbitMQ (failed connections count as part of the
+cost, as they would in production).
+
+Run from the repository root:
+
+    python -m benchmarks.bulk_create [--orders 500]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import User
+from app.schemas.order import OrderCreate
+from app.services.order_service import create_order, create_orders_bulk
+
+
+def main() -> None:
+    """Time both paths for the same number of orders and print the ratio."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        payloads = [
+            OrderCreate(items=[{"sku": f"SKU-{i}", "qty": 1}], total_price=9.5)
+            for i in range(args.orders)
+        ]
+
+        started = time.perf_counter()
+        for payload in payloads:
+            create_order(db, user_id=user.id, data=payload)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        create_orders_bulk(db, user_id=user.id, data=payloads)
+        bulk = time.perf_counter() - started
+
+        db.close()
+        engine.dispose()
+    n = args.orders
+    print(f"sequential: {sequential:.3f}s ({n / sequential:,.0f} orders/s)")
+    print(f"bulk:       {bulk:.3f}s ({n / bulk:,.0f} orders/s)")
+    print(f"speedup:    {sequential / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark order cache encodings per order size class.
+
+Compares the legacy json.dumps text, the codec without compression and
+the codec with zlib compression: encode/decode time and bytes stored.
+
+Run from the repository root:
+
+    python -m benchmarks.cache_codec
+"""
+
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from app.core.cache_codec import CacheCodec
+
+SIZE_CLASSES = {"small": 1, "medium": 20, "large": 500}
+
+
+def make_order(n_items: int) -> dict:
+    """Return an order dict shaped like _order_to_dict output."""
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": 42,
+        "total_price": 19.99 * n_items,
+        "status": "PENDING",
+        "created_at": datetime.now(timezone.utc),
+        "version": 1,
+        "items": [
+            {"sku": f"SKU-{i:06d}", "name": f"Item {i}", "qty": i % 5 + 1}
+            for i in range(n_items)
+        ],
+    }
+
+
+def legacy_encode(value) -> bytes:
+    """Encoding used before the codec (json text, utf-8 on the wire)."""
+    return json.dumps(value, default=str).encode()
+
+
+def bench(encode, decode, value, number: int) -> tuple[float, float, int]:
+    """Return (encode µs, decode µs, stored bytes) for one value."""
+    data = encode(value)
+    enc = timeit.timeit(lambda: encode(value), number=number) / number
+    dec = timeit.timeit(lambda: decode(data), number=number) / number
+    return enc * 1e6, dec * 1e6, len(data)
+
+
+def main() -> None:
+    """Print one row per (size class, encoding)."""
+    plain = CacheCodec(compress_min_bytes=0)
+    compressed = CacheCodec(compress_min_bytes=1024)
+    encodings = {
+        "legacy json": (legacy_encode, json.loads),
+        "codec": (plain.encode, plain.decode),
+        "codec+zlib": (compressed.encode, compressed.decode),
+    }
+    print(
+        f"{'class':<8}{'encoding':<14}{'enc µs':>10}{'dec µs':>10}"
+        f"{'bytes':>10}"
+    )
+    for size_class, n_items in SIZE_CLASSES.items():
+        order = make_order(n_items)
+        number = max(20, 20000 // (n_items + 1))
+        for name, (encode, decode) in encodings.items():
+            enc, dec, size = bench(encode, decode, order, number)
+            print(
+                f"{size_class:<8}{name:<14}{enc:>10.1f}{dec:>10.1f}{size:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
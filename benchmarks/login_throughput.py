@@ -0,0 +1,85 @@
+"""Benchmark login throughput against password hashing worker count.
+
+Simulates a login storm: `--concurrency` request threads verify argon2
+hashes through a PasswordHashPool (0 workers = inline in the request
+thread, as before the pool). Meanwhile a probe thread times a small
+order-like task (serializing an order dict) to show how much the storm
+slows other work in the same app worker. Uses the ARGON2_* settings.
+
+Run from the repository root:
+
+    python -m benchmarks.login_throughput [--logins 64] [--workers 0,1,2,4]
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.password_hashing import (
+    PasswordHashPool,
+    hash_password_now,
+    verify_password_now,
+)
+
+ORDER = {
+    "id": "5f0c6a52-8d1e-4a4e-9a53-2b7f3c1d9e10",
+    "user_id": 42,
+    "status": "PENDING",
+    "total_price": 99.5,
+    "items": [{"sku": f"SKU-{i:06d}", "qty": 1} for i in range(20)],
+}
+
+
+def probe(stop: threading.Event, latencies: list[float]) -> None:
+    """Time an order-sized JSON round trip every 5 ms until stopped."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        json.loads(json.dumps(ORDER))
+        latencies.append(time.perf_counter() - started)
+        stop.wait(0.005)
+
+
+def run(workers: int, logins: int, concurrency: int, hashed: str):
+    """Return (logins/s, probe p50 ms, probe p99 ms) for one pool size."""
+    pool = PasswordHashPool(workers, queue_depth=concurrency)
+    pool.start()
+    stop = threading.Event()
+    latencies: list[float] = []
+    prober = threading.Thread(target=probe, args=(stop, latencies))
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as requests:
+        results = list(
+            requests.map(
+                lambda _: pool.run(verify_password_now, "secret123", hashed),
+                range(logins),
+            )
+        )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    prober.join()
+    pool.shutdown()
+    assert all(results)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return logins / elapsed, statistics.median(latencies) * 1e3, p99 * 1e3
+
+
+def main() -> None:
+    """Print one row per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", default="0,1,2,4")
+    args = parser.parse_args()
+    hashed = hash_password_now("secret123")
+    print(f"{'workers':>8}{'logins/s':>12}{'probe p50':>12}{'probe p99':>12}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        rate, p50, p99 = run(workers, args.logins, args.concurrency, hashed)
+        print(f"{workers:>8}{rate:>12.1f}{p50:>10.3f}ms{p99:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_db
+from app.core import redis_client
+from app.core.database import Base, get_db, get_read_db
 from app.main import app
 
 # Ensure all models are registered so create_all creates their tables
@@ -37,7 +38,10 @@ def override_get_db():
 def client():
     """FastAPI test client with in-memory SQLite DB."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     Base.metadata.create_all(bind=engine)
+    # User ids restart with every test DB
+    redis_client._principal_l1.clear()
     with TestClient(app) as c:
         yield c
     Base.metadata.drop_all(bind=engine)
@@ -57,3 +61,19 @@ def auth_headers(client):
     )
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def query_log():
+    """
+    List of the SQL statements sent to the test DB while the test runs.
+    Clear it right before the request whose queries are counted.
+    """
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
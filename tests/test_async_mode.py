@@ -0,0 +1,94 @@
+"""Tests for the async request path (ASYNC_MODE routers and services)."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, async_database_url, get_async_db
+from app.routes.async_auth import router as async_auth_router
+from app.routes.async_orders import router as async_orders_router
+
+
+def test_async_database_url_swaps_driver():
+    """Sync URLs map to the async driver of their dialect."""
+    assert (
+        async_database_url("postgresql://u:p@db:5432/shop")
+        == "postgresql+asyncpg://u:p@db:5432/shop"
+    )
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db/shop")
+        == "postgresql+asyncpg://u:p@db/shop"
+    )
+    assert (
+        async_database_url("sqlite:///:memory:")
+        == "sqlite+aiosqlite:///:memory:"
+    )
+
+
+@pytest.fixture
+def async_client():
+    """Test client for an app serving the async routers on aiosqlite."""
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=StaticPool
+    )
+    asyncio.run(_create_all(engine))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_auth_router)
+    app.include_router(async_orders_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(engine.dispose())
+
+
+async def _create_all(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def test_async_routes_create_get_patch_and_list(async_client):
+    """The async handlers serve the same API as the sync ones."""
+    async_client.post(
+        "/register/",
+        json={"email": "me@example.com", "password": "secret123"},
+    )
+    r = async_client.post(
+        "/token/",
+        data={"username": "me@example.com", "password": "secret123"},
+    )
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = async_client.post(
+        "/orders/",
+        headers=headers,
+        json={"items": [{"sku": "A1"}], "total_price": 10.0},
+    )
+    assert r.status_code == 201
+    order_id = r.json()["id"]
+    r = async_client.get(f"/orders/{order_id}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["items"] == [{"sku": "A1"}]
+    r = async_client.patch(
+        f"/orders/{order_id}", headers=headers, json={"status": "PAID"}
+    )
+    assert r.json()["status"] == "PAID"
+    assert r.json()["version"] == 2
+    r = async_client.get(
+        f"/orders/user/{r.json()['user_id']}?fields=id,status",
+        headers=headers,
+    )
+    assert r.json()["items"] == [{"id": order_id, "status": "PAID"}]
+    r = async_client.get(
+        "/orders/00000000-0000-0000-0000-000000000000", headers=headers
+    )
+    assert r.status_code == 404
@@ -0,0 +1,41 @@
+"""Tests for the cache value codec (format header, compression)."""
+
+import json
+
+from app.core.cache_codec import FORMAT_JSON, FORMAT_JSON_ZLIB, CacheCodec
+
+ORDER = {
+    "id": "o1",
+    "user_id": 1,
+    "items": [{"sku": f"SKU-{i}", "qty": 1} for i in range(200)],
+}
+
+
+def test_small_value_is_plain_json_with_header():
+    """Values below the threshold are stored uncompressed."""
+    codec = CacheCodec(compress_min_bytes=1024)
+    data = codec.encode({"id": "o1"})
+    assert data[:1] == FORMAT_JSON
+    assert codec.decode(data) == {"id": "o1"}
+
+
+def test_large_value_is_compressed():
+    """Values above the threshold are zlib-compressed and smaller."""
+    codec = CacheCodec(compress_min_bytes=1024)
+    data = codec.encode(ORDER)
+    assert data[:1] == FORMAT_JSON_ZLIB
+    assert len(data) < len(json.dumps(ORDER))
+    assert codec.decode(data) == ORDER
+
+
+def test_zero_threshold_disables_compression():
+    """compress_min_bytes=0 never compresses."""
+    codec = CacheCodec(compress_min_bytes=0)
+    assert codec.encode(ORDER)[:1] == FORMAT_JSON
+
+
+def test_decodes_legacy_json_entries():
+    """Entries written as plain JSON text before the codec still decode."""
+    codec = CacheCodec()
+    legacy = json.dumps(ORDER, default=str).encode()
+    assert codec.decode(legacy) == ORDER
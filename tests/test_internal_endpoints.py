@@ -0,0 +1,35 @@
+"""Tests for access to the internal metrics endpoints."""
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    """Configure an internal API token and return it."""
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "s3cret")
+    return "s3cret"
+
+
+def test_cache_stats_hidden_without_configured_token(client):
+    """With no INTERNAL_API_TOKEN the endpoint does not exist."""
+    response = client.get(
+        "/internal/cache/stats", headers={"X-Internal-Token": ""}
+    )
+    assert response.status_code == 404
+
+
+def test_cache_stats_requires_matching_token(client, internal_token):
+    """Only requests with the configured token see the counters."""
+    assert client.get("/internal/cache/stats").status_code == 404
+    response = client.get(
+        "/internal/cache/stats", headers={"X-Internal-Token": "wrong"}
+    )
+    assert response.status_code == 404
+    response = client.get(
+        "/internal/cache/stats",
+        headers={"X-Internal-Token": internal_token},
+    )
+    assert response.status_code == 200
+    assert set(response.json()) == {"orders", "principals", "tokens"}
@@ -0,0 +1,36 @@
+"""Tests for the in-process TTL LRU cache."""
+
+from unittest.mock import patch
+
+from app.core.local_cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Beyond maxsize the least recently used key is evicted."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    """Entries are not served after their TTL."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    with patch("app.core.local_cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.core.local_cache.time.monotonic", return_value=104.9):
+        assert cache.get("a") == 1
+    with patch("app.core.local_cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_ttl_cache_disabled_when_size_zero():
+    """maxsize 0 stores nothing."""
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,165 @@
+"""Tests for the orders archive tier and transparent reads from it."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.core import redis_client
+from app.models.order import Order
+from app.models.order_archive import OrderArchive
+from app.services.order_archive_service import (
+    archive_closed_orders,
+    archive_cutoff,
+)
+from app.services.order_summary_service import (
+    get_user_summary,
+    rebuild_user_summaries,
+)
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture(autouse=True)
+def clear_l1():
+    """Serve every read from the DB; Redis is not running in tests."""
+    redis_client._order_l1.clear()
+    yield
+    redis_client._order_l1.clear()
+
+
+def _create(client, headers, days_old, status="PENDING"):
+    """Create an order days_old days ago with the given status."""
+    r = client.post(
+        "/orders/",
+        headers=headers,
+        json={"items": [{"sku": "A1"}], "total_price": 10.0},
+    )
+    order_id = r.json()["id"]
+    if status != "PENDING":
+        client.patch(
+            f"/orders/{order_id}", headers=headers, json={"status": status}
+        )
+    db = TestingSessionLocal()
+    db.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .values(
+            created_at=datetime.now(timezone.utc) - timedelta(days=days_old)
+        )
+    )
+    db.commit()
+    db.close()
+    return order_id
+
+
+def _archive():
+    """Run the archive job with the default cutoff."""
+    db = TestingSessionLocal()
+    try:
+        return archive_closed_orders(db, archive_cutoff(), batch_size=1)
+    finally:
+        db.close()
+        redis_client._order_l1.clear()
+
+
+def _count(model):
+    """Return the number of rows of model."""
+    db = TestingSessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(model))
+    finally:
+        db.close()
+
+
+def test_archive_moves_only_old_closed_orders(client, auth_headers):
+    """Old SHIPPED/CANCELED orders move; open and recent ones stay."""
+    _create(client, auth_headers, 200, "SHIPPED")
+    _create(client, auth_headers, 150, "CANCELED")
+    _create(client, auth_headers, 200, "PENDING")
+    _create(client, auth_headers, 10, "SHIPPED")
+    assert _archive() == 2
+    assert _count(Order) == 2
+    assert _count(OrderArchive) == 2
+    assert _archive() == 0
+
+
+def test_get_and_batch_fall_back_to_archive(client, auth_headers):
+    """Archived orders are still served by id, singly and in batches."""
+    order_id = _create(client, auth_headers, 200, "SHIPPED")
+    _archive()
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "SHIPPED"
+    assert response.json()["items"] == [{"sku": "A1"}]
+    redis_client._order_l1.clear()
+    response = client.post(
+        "/orders/batch", headers=auth_headers, json={"ids": [order_id]}
+    )
+    assert [o["id"] for o in response.json()["orders"]] == [order_id]
+
+
+def test_list_merges_archived_orders_newest_first(client, auth_headers):
+    """Pages interleave hot and archived orders by created_at."""
+    recent = _create(client, auth_headers, 1)
+    archived = _create(client, auth_headers, 100, "CANCELED")
+    old_open = _create(client, auth_headers, 300)
+    older_archived = _create(client, auth_headers, 400, "SHIPPED")
+    _archive()
+    first = client.get(
+        "/orders/user/1", headers=auth_headers, params={"limit": 2}
+    ).json()
+    assert [o["id"] for o in first["items"]] == [recent, archived]
+    second = client.get(
+        "/orders/user/1",
+        headers=auth_headers,
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+    assert [o["id"] for o in second["items"]] == [old_open, older_archived]
+    assert second["next_cursor"] is None
+
+
+def test_search_and_export_include_archived_orders(client, auth_headers):
+    """SKU search and the NDJSON export see archived orders."""
+    recent = _create(client, auth_headers, 1)
+    archived = _create(client, auth_headers, 200, "SHIPPED")
+    _archive()
+    response = client.get(
+        "/orders/user/1/search",
+        headers=auth_headers,
+        params={"sku": "A1"},
+    )
+    assert [o["id"] for o in response.json()["items"]] == [recent, archived]
+    response = client.get("/orders/user/1/export", headers=auth_headers)
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [recent, archived]
+
+
+def test_patch_updates_archived_order_in_place(client, auth_headers):
+    """A status change on an archived order is applied in the archive."""
+    order_id = _create(client, auth_headers, 200, "CANCELED")
+    _archive()
+    response = client.patch(
+        f"/orders/{order_id}", headers=auth_headers, json={"status": "PAID"}
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "PAID"
+    db = TestingSessionLocal()
+    archived = db.get(OrderArchive, order_id)
+    assert archived.status == "PAID"
+    assert archived.version == 3
+    db.close()
+
+
+def test_rebuild_summaries_counts_archived_orders(client, auth_headers):
+    """The rollup backfill aggregates hot and archived orders."""
+    _create(client, auth_headers, 200, "SHIPPED")
+    _create(client, auth_headers, 1)
+    _archive()
+    db = TestingSessionLocal()
+    rebuild_user_summaries(db)
+    summary = get_user_summary(db, 1, 1)
+    db.close()
+    assert summary["counts"]["SHIPPED"] == 1
+    assert summary["counts"]["PENDING"] == 1
+    assert summary["total_spend"] == 20.0
@@ -0,0 +1,84 @@
+"""Tests for POST /orders/batch (get many orders by id)."""
+
+from unittest.mock import patch
+
+
+def _create(client, headers, total):
+    r = client.post(
+        "/orders/",
+        headers=headers,
+        json={"items": [{"sku": "A1"}], "total_price": total},
+    )
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_batch_returns_orders_in_request_order(client, auth_headers):
+    """Batch returns own orders in request order, duplicates collapsed."""
+    first = _create(client, auth_headers, 1.0)
+    second = _create(client, auth_headers, 2.0)
+    response = client.post(
+        "/orders/batch",
+        headers=auth_headers,
+        json={"ids": [second, first, second]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["id"] for o in data["orders"]] == [second, first]
+    assert data["orders"][0]["total_price"] == 2.0
+    assert data["not_found"] == []
+
+
+def test_batch_reports_unknown_and_foreign_ids(client, auth_headers):
+    """Unknown ids and other users' orders are listed in not_found."""
+    own = _create(client, auth_headers, 1.0)
+    client.post(
+        "/register/",
+        json={"email": "other@example.com", "password": "other123"},
+    )
+    r = client.post(
+        "/token/",
+        data={"username": "other@example.com", "password": "other123"},
+    )
+    other_headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    foreign = _create(client, other_headers, 5.0)
+    response = client.post(
+        "/orders/batch",
+        headers=auth_headers,
+        json={"ids": [own, foreign, "missing"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["id"] for o in data["orders"]] == [own]
+    assert data["not_found"] == [foreign, "missing"]
+
+
+def test_batch_rejects_empty_ids(client, auth_headers):
+    """An empty id list returns 422."""
+    response = client.post(
+        "/orders/batch", headers=auth_headers, json={"ids": []}
+    )
+    assert response.status_code == 422
+
+
+def test_batch_requires_auth(client):
+    """Batch without token returns 401."""
+    response = client.post("/orders/batch", json={"ids": ["x"]})
+    assert response.status_code == 401
+
+
+def test_batch_treats_incomplete_cache_entries_as_misses(client, auth_headers):
+    """A cached order lacking head fields is reloaded from the database."""
+    order_id = _create(client, auth_headers, 3.0)
+    partial = {"id": order_id, "items": []}
+    with patch(
+        "app.services.order_service.cache_order_get_many",
+        return_value={order_id: partial},
+    ):
+        response = client.post(
+            "/orders/batch", headers=auth_headers, json={"ids": [order_id]}
+        )
+    assert response.status_code == 200
+    orders = response.json()["orders"]
+    assert [o["id"] for o in orders] == [order_id]
+    assert orders[0]["total_price"] == 3.0
@@ -0,0 +1,101 @@
+"""Tests for POST /orders/bulk (create many orders in one transaction)."""
+
+from unittest.mock import patch
+
+
+def test_bulk_create_returns_orders_in_input_order(client, auth_headers):
+    """Every payload becomes an order; results keep the input order."""
+    payload = {
+        "orders": [
+            {"items": [{"sku": f"S{i}"}], "total_price": float(i + 1)}
+            for i in range(5)
+        ]
+    }
+    with patch(
+        "app.services.order_service.publish_new_orders"
+    ) as mock_publish:
+        response = client.post(
+            "/orders/bulk", headers=auth_headers, json=payload
+        )
+    assert response.status_code == 201
+    orders = response.json()["orders"]
+    assert [o["total_price"] for o in orders] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert all(o["status"] == "PENDING" for o in orders)
+    assert len({o["id"] for o in orders}) == 5
+    mock_publish.assert_called_once_with(
+        [(o["id"], o["user_id"]) for o in orders]
+    )
+
+
+def test_bulk_create_updates_summary_and_is_readable(client, auth_headers):
+    """Bulk-created orders are counted in the rollup and can be read."""
+    response = client.post(
+        "/orders/bulk",
+        headers=auth_headers,
+        json={
+            "orders": [
+                {"items": [], "total_price": 10.0},
+                {"items": [], "total_price": 5.0},
+            ]
+        },
+    )
+    orders = response.json()["orders"]
+    user_id = orders[0]["user_id"]
+    summary = client.get(
+        f"/orders/user/{user_id}/summary", headers=auth_headers
+    ).json()
+    assert summary["counts"]["PENDING"] == 2
+    assert summary["total_spend"] == 15.0
+    r = client.get(f"/orders/{orders[1]['id']}", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json()["total_price"] == 5.0
+
+
+def test_bulk_create_rejects_empty_and_invalid(client, auth_headers):
+    """An empty list or any invalid payload rejects the whole request."""
+    r = client.post("/orders/bulk", headers=auth_headers, json={"orders": []})
+    assert r.status_code == 422
+    r = client.post(
+        "/orders/bulk",
+        headers=auth_headers,
+        json={
+            "orders": [
+                {"items": [], "total_price": 1.0},
+                {"items": [], "total_price": -1.0},
+            ]
+        },
+    )
+    assert r.status_code == 422
+
+
+def test_bulk_create_mixed_batch_creates_nothing(client, auth_headers):
+    """Valid orders next to an invalid one are not created either."""
+    payload = {
+        "orders": [
+            {"items": [{"sku": "A1"}], "total_price": 1.0},
+            {"items": [], "total_price": 0},
+            {"items": [{"sku": "B2"}], "total_price": 2.0},
+        ]
+    }
+    r = client.post("/orders/bulk", headers=auth_headers, json=payload)
+    assert r.status_code == 422
+    assert [e["loc"] for e in r.json()["detail"]] == [
+        ["body", "orders", 1, "total_price"]
+    ]
+    r = client.get("/orders/user/1", headers=auth_headers)
+    assert r.json()["items"] == []
+
+
+def test_bulk_create_clears_negative_cache_entries(client, auth_headers):
+    """Every created id has its negative cache entry dropped."""
+    payload = {"orders": [{"items": [], "total_price": 1.0}] * 3}
+    with patch(
+        "app.services.order_service.cache_order_clear_missing"
+    ) as mock_clear:
+        response = client.post(
+            "/orders/bulk", headers=auth_headers, json=payload
+        )
+    assert response.status_code == 201
+    assert [c.args[0] for c in mock_clear.call_args_list] == [
+        o["id"] for o in response.json()["orders"]
+    ]
@@ -1,6 +1,28 @@
 """Tests for cache invalidation on update and new_order event publish on create."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import redis_client
+from app.core.redis_client import (
+    ORDER_INVALIDATION_CHANNEL,
+    OrderInvalidationListener,
+    cache_order_delete,
+    cache_order_get,
+    cache_order_lookup,
+    cache_order_set,
+    cache_order_write_through,
+    order_invalidation_message,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_l1():
+    """Start every test with an empty in-process order cache."""
+    redis_client._order_l1.clear()
+    yield
+    redis_client._order_l1.clear()
 
 
 def test_new_order_event_published_on_create(client, auth_headers):
@@ -39,3 +61,209 @@ def test_cache_invalidated_on_patch(client, auth_headers):
             json={"status": "PAID"},
         )
         mock_delete.assert_called_once_with(order_id)
+
+
+def _fake_redis(values, pttl=300000):
+    """Return a fake client whose pipeline yields (HMGET values, PTTL)."""
+    fake = MagicMock()
+    fake.pipeline.return_value.execute.return_value = [values, pttl]
+    return fake
+
+
+def test_cache_get_without_items_skips_items_field():
+    """Reading without items fetches only the head of the hash."""
+    fake = _fake_redis([b'{"id": "o1", "user_id": 1}', None])
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        data = cache_order_get("o1", with_items=False)
+    assert data == {"id": "o1", "user_id": 1}
+    fake.pipeline.return_value.hmget.assert_called_once_with(
+        "order:o1", ["head", "delta"]
+    )
+
+
+def test_cache_get_with_items_requires_both_fields():
+    """A hash without the items field is a miss when items are needed."""
+    fake = _fake_redis([b'{"id": "o1", "user_id": 1}', None, None])
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        assert cache_order_get("o1") is None
+
+
+def test_cache_lookup_returns_ttl_and_delta():
+    """Lookup reports remaining TTL and recorded load time for refresh."""
+    fake = _fake_redis([b'{"id": "o1"}', b"0.25", b"[]"], pttl=1500)
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        data, ttl, delta = cache_order_lookup("o1")
+    assert data == {"id": "o1", "items": []}
+    assert ttl == 1.5
+    assert delta == 0.25
+
+
+def test_l1_hit_skips_redis():
+    """A second read of the same order is served from the in-process L1."""
+    fake = _fake_redis([b'{"id": "o1", "user_id": 1}', None, b"[]"])
+    expected = {"id": "o1", "user_id": 1, "items": []}
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        assert cache_order_get("o1") == expected
+        assert cache_order_get("o1") == expected
+    fake.pipeline.return_value.execute.assert_called_once()
+
+
+def test_delete_evicts_l1_and_broadcasts():
+    """Invalidation drops the L1 entry and publishes the order id."""
+    fake = _fake_redis([None, None, None])
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        cache_order_set("o1", {"id": "o1", "user_id": 1, "items": []})
+        cache_order_delete("o1")
+        assert cache_order_get("o1") is None
+    fake.publish.assert_called_once_with(
+        ORDER_INVALIDATION_CHANNEL, order_invalidation_message("o1")
+    )
+
+
+def test_listener_keeps_l1_filled_by_own_write_through():
+    """
+    A worker ignores its own order invalidations, so the entry its write
+    through just stored stays in L1; other workers' messages evict.
+    """
+    fake = _fake_redis([None, None, None])
+    order = {"id": "o1", "user_id": 1, "items": []}
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        cache_order_write_through("o1", order)
+    channel, message = fake.publish.call_args.args
+    OrderInvalidationListener.evict(channel.encode(), message.encode())
+    assert redis_client._order_l1.get("o1") == order
+    OrderInvalidationListener.evict(channel.encode(), b"other.1:o1")
+    assert redis_client._order_l1.get("o1") is None
+    redis_client._order_l1.set("o1", order)
+    OrderInvalidationListener.evict(channel.encode(), b"o1")
+    assert redis_client._order_l1.get("o1") is None
+
+
+def test_list_version_cached_on_create_and_patch(client, auth_headers):
+    """Order writes cache the user's new orders_version after commit."""
+    with patch(
+        "app.services.order_service.cache_user_orders_version_set",
+    ) as mock_set:
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [], "total_price": 1.0},
+        )
+        client.patch(
+            f"/orders/{r.json()['id']}",
+            headers=auth_headers,
+            json={"status": "PAID"},
+        )
+    assert [c.args for c in mock_set.call_args_list] == [(1, 1), (1, 2)]
+
+
+def test_list_page_hit_uses_cached_version_for_etag(
+    client, auth_headers, query_log
+):
+    """
+    A cached page is sent under the ETag of the cached version it is
+    stored for, even if the DB has moved on, and needs no DB query.
+    """
+    page = {"items": [], "next_cursor": None}
+    client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [], "total_price": 1.0},
+    )
+    with (
+        patch(
+            "app.services.order_service.cache_user_orders_version_get",
+            return_value=7,
+        ),
+        patch(
+            "app.services.order_service.cache_user_orders_get",
+            return_value=page,
+        ) as mock_get,
+        patch(
+            "app.services.order_service.cache_user_orders_set",
+        ) as mock_set,
+    ):
+        query_log.clear()
+        response = client.get("/orders/user/1", headers=auth_headers)
+    assert response.json()["items"] == []
+    assert response.headers["ETag"].startswith('"u1.7.')
+    assert mock_get.call_args.args[:2] == (1, 7)
+    mock_set.assert_not_called()
+    assert query_log == []
+
+
+def test_list_page_cached_under_version_of_its_etag(client, auth_headers):
+    """On a version miss the DB version keys both the ETag and the page."""
+    client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [], "total_price": 1.0},
+    )
+    with (
+        patch(
+            "app.services.order_service.cache_user_orders_version_get",
+            return_value=None,
+        ),
+        patch(
+            "app.services.order_service.cache_user_orders_set",
+        ) as mock_set,
+    ):
+        response = client.get("/orders/user/1", headers=auth_headers)
+    user_id, version, _digest, page = mock_set.call_args.args
+    assert (user_id, version) == (1, 1)
+    assert response.headers["ETag"].startswith('"u1.1.')
+    assert len(page["items"]) == 1
+
+
+def test_write_through_on_patch_caches_new_version(client, auth_headers):
+    """In write_through mode PATCH stores the updated order in the cache."""
+    r = client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [], "total_price": 1.0},
+    )
+    order_id = r.json()["id"]
+    with (
+        patch(
+            "app.services.order_service.settings.CACHE_WRITE_MODE",
+            "write_through",
+        ),
+        patch(
+            "app.services.order_service.cache_order_write_through",
+        ) as mock_write,
+        patch(
+            "app.services.order_service.cache_order_delete",
+        ) as mock_delete,
+    ):
+        client.patch(
+            f"/orders/{order_id}",
+            headers=auth_headers,
+            json={"status": "PAID"},
+        )
+    mock_delete.assert_not_called()
+    written_id, data = mock_write.call_args.args
+    assert written_id == order_id
+    assert data["status"] == "PAID"
+    assert data["version"] == 2
+
+
+def test_cache_set_rejected_by_version_guard_skips_l1():
+    """When Redis holds a newer version the stale write is dropped."""
+    fake = MagicMock()
+    fake.register_script.return_value.return_value = 0
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        cache_order_set("o1", {"id": "o1", "version": 1, "items": []})
+    assert redis_client._order_l1.peek("o1") is None
+    args = fake.register_script.return_value.call_args.kwargs["args"]
+    assert args[0] == 1
+
+
+def test_cache_set_does_not_downgrade_l1():
+    """An older version never replaces a newer one in L1."""
+    newer = {"id": "o1", "version": 3, "items": []}
+    redis_client._order_l1.set("o1", newer)
+    fake = MagicMock()
+    with patch("app.core.redis_client.get_redis", return_value=fake):
+        cache_order_set("o1", {"id": "o1", "version": 2, "items": []})
+    assert redis_client._order_l1.peek("o1") == newer
+    fake.register_script.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for POST /orders/ (order creation)."""
 
+import uuid
+
 
 def test_create_order_success(client, auth_headers):
     """Create order with valid JWT and body returns 201 and order representation."""
@@ -25,3 +27,44 @@ def test_create_order_unauthenticated_returns_401(client):
         json={"items": [], "total_price": 10.0},
     )
     assert response.status_code == 401
+
+
+def test_create_order_is_one_insert_returning(client, auth_headers, query_log):
+    """
+    Create costs INSERT ... RETURNING and the rollup; the user comes from
+    the principal cache warmed at login.
+    """
+    query_log.clear()
+    response = client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [], "total_price": 5.0},
+    )
+    assert response.status_code == 201
+    assert len(query_log) == 2
+    insert, upsert = query_log
+    assert insert.startswith("INSERT INTO orders")
+    assert "RETURNING" in insert
+    assert upsert.startswith("INSERT INTO user_order_summaries")
+
+
+def test_order_ids_are_server_generated_uuid4(client, auth_headers):
+    """
+    Ids are always uuid4 from the app, never client-supplied: they are
+    what keeps ids unique across the orders partitions.
+    """
+    supplied = str(uuid.uuid4())
+    single = client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"id": supplied, "items": [], "total_price": 1.0},
+    ).json()
+    bulk = client.post(
+        "/orders/bulk",
+        headers=auth_headers,
+        json={"orders": [{"id": supplied, "items": [], "total_price": 1.0}]},
+    ).json()["orders"]
+    ids = [single["id"], *(o["id"] for o in bulk)]
+    assert supplied not in ids
+    assert len(set(ids)) == len(ids)
+    assert all(uuid.UUID(order_id).version == 4 for order_id in ids)
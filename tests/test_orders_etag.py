@@ -0,0 +1,96 @@
+"""Tests for ETag / If-None-Match on order reads."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services.order_service import get_order_by_id
+
+
+@pytest.fixture
+def order_id(client, auth_headers):
+    """Create an order and return its id."""
+    r = client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [{"sku": "A1"}], "total_price": 15.0},
+    )
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_get_order_returns_etag_and_304(client, auth_headers, order_id):
+    """A matching If-None-Match returns 304 with no body."""
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["version"] == 1
+    etag = response.headers["etag"]
+    response = client.get(
+        f"/orders/{order_id}",
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_get_order_etag_mismatch_does_one_lookup(
+    client, auth_headers, order_id
+):
+    """A stale If-None-Match gets the body from a single order lookup."""
+    with patch(
+        "app.routes.orders.get_order_by_id", wraps=get_order_by_id
+    ) as lookup:
+        response = client.get(
+            f"/orders/{order_id}",
+            headers={**auth_headers, "If-None-Match": '"stale"'},
+        )
+    assert response.status_code == 200
+    assert response.json()["id"] == order_id
+    lookup.assert_called_once()
+
+
+def test_get_order_etag_changes_after_update(client, auth_headers, order_id):
+    """A status change bumps the version, so the old ETag no longer matches."""
+    etag = client.get(f"/orders/{order_id}", headers=auth_headers).headers[
+        "etag"
+    ]
+    client.patch(
+        f"/orders/{order_id}", headers=auth_headers, json={"status": "PAID"}
+    )
+    response = client.get(
+        f"/orders/{order_id}",
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["etag"] != etag
+
+
+def test_get_order_etag_differs_per_fieldset(client, auth_headers, order_id):
+    """Projected representations carry their own ETag."""
+    full = client.get(f"/orders/{order_id}", headers=auth_headers)
+    partial = client.get(
+        f"/orders/{order_id}",
+        headers=auth_headers,
+        params={"fields": "id,status"},
+    )
+    assert full.headers["etag"] != partial.headers["etag"]
+
+
+def test_list_orders_etag_and_304(client, auth_headers, order_id):
+    """List ETag matches until the user's orders change."""
+    response = client.get("/orders/user/1", headers=auth_headers)
+    etag = response.headers["etag"]
+    response = client.get(
+        "/orders/user/1", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    client.patch(
+        f"/orders/{order_id}", headers=auth_headers, json={"status": "PAID"}
+    )
+    response = client.get(
+        "/orders/user/1", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -0,0 +1,34 @@
+"""Tests for GET /orders/user/{user_id}/export (NDJSON stream)."""
+
+import json
+
+
+def test_export_orders_streams_ndjson(client, auth_headers):
+    """Export returns one JSON object per line, newest first."""
+    ids = []
+    for price in (1.0, 2.0, 3.0):
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [{"sku": "A1"}], "total_price": price},
+        )
+        ids.append(r.json()["id"])
+    response = client.get("/orders/user/1/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    orders = [json.loads(line) for line in lines]
+    assert [o["id"] for o in orders] == list(reversed(ids))
+    assert orders[0]["items"] == [{"sku": "A1"}]
+
+
+def test_export_orders_other_user_returns_403(client, auth_headers):
+    """Exporting another user's orders returns 403."""
+    response = client.get("/orders/user/999/export", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_export_orders_unauthenticated_returns_401(client):
+    """Export without JWT returns 401."""
+    response = client.get("/orders/user/1/export")
+    assert response.status_code == 401
@@ -1,5 +1,7 @@
 """Tests for GET /orders/{order_id} (get order by id, cache-first)."""
 
+from unittest.mock import patch
+
 import pytest
 
 
@@ -52,3 +54,72 @@ def test_get_order_unauthenticated_returns_401(client, order_id):
     """GET /orders/{id} without JWT returns 401."""
     response = client.get(f"/orders/{order_id}")
     assert response.status_code == 401
+
+
+def test_get_order_sparse_fields(client, auth_headers, order_id):
+    """GET with ?fields= returns only the requested fields."""
+    response = client.get(
+        f"/orders/{order_id}",
+        headers=auth_headers,
+        params={"fields": "id,status,total_price"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": order_id,
+        "status": "PENDING",
+        "total_price": 15.0,
+    }
+
+
+def test_get_order_unknown_field_returns_400(client, auth_headers, order_id):
+    """GET with an unknown field name in ?fields= returns 400."""
+    response = client.get(
+        f"/orders/{order_id}",
+        headers=auth_headers,
+        params={"fields": "id,secret"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_order_malformed_id_returns_404_without_lookup(
+    client, auth_headers
+):
+    """A malformed id is rejected before any cache or DB lookup."""
+    with patch("app.services.order_service.cache_order_lookup") as mock_lookup:
+        response = client.get("/orders/not-a-uuid", headers=auth_headers)
+    assert response.status_code == 404
+    mock_lookup.assert_not_called()
+
+
+def test_get_order_unknown_id_is_negatively_cached(client, auth_headers):
+    """A DB miss is remembered; a remembered miss skips the DB."""
+    unknown = "00000000-0000-0000-0000-000000000001"
+    with patch(
+        "app.services.order_service.cache_order_set_missing"
+    ) as mock_set_missing:
+        response = client.get(f"/orders/{unknown}", headers=auth_headers)
+    assert response.status_code == 404
+    mock_set_missing.assert_called_once_with(unknown)
+    with (
+        patch(
+            "app.services.order_service.cache_order_is_missing",
+            return_value=True,
+        ),
+        patch("app.services.order_service._load_order") as mock_load,
+    ):
+        response = client.get(f"/orders/{unknown}", headers=auth_headers)
+    assert response.status_code == 404
+    mock_load.assert_not_called()
+
+
+def test_create_order_clears_negative_cache_entry(client, auth_headers):
+    """Creating an order drops any negative cache entry for its id."""
+    with patch(
+        "app.services.order_service.cache_order_clear_missing"
+    ) as mock_clear:
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [], "total_price": 1.0},
+        )
+    mock_clear.assert_called_once_with(r.json()["id"])
@@ -11,9 +11,49 @@ def test_list_orders_own_user(client, auth_headers):
     response = client.get("/orders/user/1", headers=auth_headers)
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 1
-    assert data[0]["user_id"] == 1
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 1
+    assert data["items"][0]["user_id"] == 1
+    assert data["next_cursor"] is None
+
+
+def test_list_orders_paginates_with_cursor(client, auth_headers):
+    """Pages follow next_cursor newest first without gaps or duplicates."""
+    created = []
+    for i in range(5):
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [], "total_price": float(i + 1)},
+        )
+        created.append(r.json()["id"])
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(
+            "/orders/user/1", headers=auth_headers, params=params
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(o["id"] for o in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(reversed(created))
+
+
+def test_list_orders_invalid_cursor_returns_400(client, auth_headers):
+    """A malformed cursor returns 400."""
+    response = client.get(
+        "/orders/user/1",
+        headers=auth_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
 
 
 def test_list_orders_other_user_returns_403(client, auth_headers):
@@ -26,3 +66,63 @@ def test_list_orders_unauthenticated_returns_401(client):
     """GET /orders/user/1 without JWT returns 401."""
     response = client.get("/orders/user/1")
     assert response.status_code == 401
+
+
+def test_list_orders_sparse_fields(client, auth_headers):
+    """List with ?fields= returns only the requested fields per order."""
+    client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [{"x": 1}], "total_price": 5.0},
+    )
+    response = client.get(
+        "/orders/user/1",
+        headers=auth_headers,
+        params={"fields": "id,status"},
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 1
+    assert set(items[0]) == {"id", "status"}
+
+
+def test_list_orders_filters_by_status_and_date(client, auth_headers):
+    """status, created_from and created_to narrow the listing."""
+    ids = []
+    for price in (1.0, 2.0):
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [], "total_price": price},
+        )
+        ids.append(r.json()["id"])
+    client.patch(
+        f"/orders/{ids[0]}", headers=auth_headers, json={"status": "PAID"}
+    )
+    response = client.get(
+        "/orders/user/1", headers=auth_headers, params={"status": "PAID"}
+    )
+    assert response.status_code == 200
+    assert [o["id"] for o in response.json()["items"]] == [ids[0]]
+
+    response = client.get(
+        "/orders/user/1",
+        headers=auth_headers,
+        params={"created_to": "2000-01-01T00:00:00"},
+    )
+    assert response.json()["items"] == []
+
+    response = client.get(
+        "/orders/user/1",
+        headers=auth_headers,
+        params={"created_from": "2000-01-01T00:00:00"},
+    )
+    assert len(response.json()["items"]) == 2
+
+
+def test_list_orders_invalid_status_returns_422(client, auth_headers):
+    """An unknown status filter value is rejected."""
+    response = client.get(
+        "/orders/user/1", headers=auth_headers, params={"status": "LOST"}
+    )
+    assert response.status_code == 422
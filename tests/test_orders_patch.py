@@ -52,3 +52,47 @@ def test_patch_order_unauthenticated_returns_401(client, order_id):
         json={"status": "CANCELED"},
     )
     assert response.status_code == 401
+
+
+def test_patch_order_is_one_update_returning(
+    client, auth_headers, order_id, query_log
+):
+    """
+    Update costs one UPDATE ... RETURNING that also checks ownership,
+    and the rollup; no reload after commit. (SQLite
+    adds a SELECT of the previous status; Postgres returns it from the
+    UPDATE.)
+    """
+    query_log.clear()
+    response = client.patch(
+        f"/orders/{order_id}", headers=auth_headers, json={"status": "PAID"}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert len(query_log) == 3
+    update, upsert = query_log[1:]
+    assert update.startswith("UPDATE orders")
+    assert "RETURNING" in update
+    assert upsert.startswith("INSERT INTO user_order_summaries")
+
+
+def test_patch_foreign_order_writes_nothing(client, auth_headers, order_id):
+    """A PATCH of another user's order leaves order and rollup untouched."""
+    client.post(
+        "/register/",
+        json={"email": "other@example.com", "password": "secret123"},
+    )
+    token = client.post(
+        "/token/",
+        data={"username": "other@example.com", "password": "secret123"},
+    ).json()["access_token"]
+    response = client.patch(
+        f"/orders/{order_id}",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"status": "CANCELED"},
+    )
+    assert response.status_code == 404
+    summary = client.get("/orders/user/1/summary", headers=auth_headers)
+    assert summary.json()["counts"]["PENDING"] == 1
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.json()["status"] == "PENDING"
@@ -0,0 +1,68 @@
+"""Tests for GET /orders/user/{user_id}/search (orders by item SKU)."""
+
+
+def _create(client, headers, skus):
+    r = client.post(
+        "/orders/",
+        headers=headers,
+        json={
+            "items": [{"sku": sku, "qty": 1} for sku in skus],
+            "total_price": 1.0,
+        },
+    )
+    return r.json()
+
+
+def test_search_returns_orders_containing_sku(client, auth_headers):
+    """Only orders with an item of the given SKU are returned, newest first."""
+    first = _create(client, auth_headers, ["A1", "B2"])
+    _create(client, auth_headers, ["C3"])
+    third = _create(client, auth_headers, ["B2"])
+    response = client.get(
+        f"/orders/user/{first['user_id']}/search",
+        params={"sku": "B2"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["id"] for o in data["items"]] == [third["id"], first["id"]]
+    assert data["next_cursor"] is None
+
+
+def test_search_paginates_and_matches_whole_sku(client, auth_headers):
+    """A SKU prefix does not match; results page with a cursor."""
+    orders = [_create(client, auth_headers, ["SKU-10"]) for _ in range(3)]
+    user_id = orders[0]["user_id"]
+    r = client.get(
+        f"/orders/user/{user_id}/search",
+        params={"sku": "SKU-1"},
+        headers=auth_headers,
+    )
+    assert r.json()["items"] == []
+    r = client.get(
+        f"/orders/user/{user_id}/search",
+        params={"sku": "SKU-10", "limit": 2},
+        headers=auth_headers,
+    )
+    page = r.json()
+    assert len(page["items"]) == 2
+    r = client.get(
+        f"/orders/user/{user_id}/search",
+        params={"sku": "SKU-10", "cursor": page["next_cursor"]},
+        headers=auth_headers,
+    )
+    assert [o["id"] for o in r.json()["items"]] == [orders[0]["id"]]
+
+
+def test_search_other_user_returns_403(client, auth_headers):
+    """Searching another user's orders is forbidden."""
+    response = client.get(
+        "/orders/user/999/search", params={"sku": "A1"}, headers=auth_headers
+    )
+    assert response.status_code == 403
+
+
+def test_search_requires_sku(client, auth_headers):
+    """A missing sku parameter returns 422."""
+    response = client.get("/orders/user/1/search", headers=auth_headers)
+    assert response.status_code == 422
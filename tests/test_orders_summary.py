@@ -0,0 +1,97 @@
+"""Tests for GET /orders/user/{user_id}/summary and the rollup backfill."""
+
+from app.models.order_summary import UserOrderSummary
+from app.services.order_summary_service import (
+    pop_orders_versions,
+    rebuild_user_summaries,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _create(client, headers, price):
+    """Create an order with the given total price and return its id."""
+    r = client.post(
+        "/orders/",
+        headers=headers,
+        json={"items": [], "total_price": price},
+    )
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def test_summary_tracks_creates_and_status_changes(client, auth_headers):
+    """Rollup reflects creates, status moves and cancellations."""
+    first = _create(client, auth_headers, 10.0)
+    second = _create(client, auth_headers, 5.0)
+    client.patch(
+        f"/orders/{first}", headers=auth_headers, json={"status": "PAID"}
+    )
+    client.patch(
+        f"/orders/{second}",
+        headers=auth_headers,
+        json={"status": "CANCELED"},
+    )
+    response = client.get("/orders/user/1/summary", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["counts"] == {
+        "PENDING": 0,
+        "PAID": 1,
+        "SHIPPED": 0,
+        "CANCELED": 1,
+    }
+    assert data["total_spend"] == 10.0
+    assert data["last_order_at"] is not None
+
+
+def test_summary_empty_user_returns_zeros(client, auth_headers):
+    """A user without orders gets zero counts and no last order time."""
+    response = client.get("/orders/user/1/summary", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert sum(data["counts"].values()) == 0
+    assert data["total_spend"] == 0.0
+    assert data["last_order_at"] is None
+
+
+def test_summary_other_user_returns_403(client, auth_headers):
+    """Requesting another user's summary returns 403."""
+    response = client.get("/orders/user/999/summary", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_rebuild_user_summaries_restores_rollup(client, auth_headers):
+    """Backfill recomputes a rollup that was lost or drifted."""
+    _create(client, auth_headers, 7.0)
+    _create(client, auth_headers, 3.0)
+    db = TestingSessionLocal()
+    try:
+        db.query(UserOrderSummary).delete()
+        db.commit()
+        assert rebuild_user_summaries(db, batch_size=1) == 1
+    finally:
+        db.close()
+    data = client.get("/orders/user/1/summary", headers=auth_headers).json()
+    assert data["counts"]["PENDING"] == 2
+    assert data["total_spend"] == 10.0
+
+
+def test_rebuild_user_summaries_upserts_and_bumps_version(
+    client, auth_headers
+):
+    """Backfill overwrites drifted rows in place with a new version."""
+    _create(client, auth_headers, 7.0)
+    db = TestingSessionLocal()
+    try:
+        summary = db.get(UserOrderSummary, 1)
+        summary.pending_count = 5
+        db.commit()
+        version = summary.orders_version
+        rebuild_user_summaries(db)
+        assert pop_orders_versions(db) == {1: version + 1}
+        db.expire_all()
+        summary = db.get(UserOrderSummary, 1)
+        assert summary.pending_count == 1
+        assert summary.orders_version == version + 1
+    finally:
+        db.close()
@@ -0,0 +1,78 @@
+"""Tests for the argon2 password hashing process pool."""
+
+import threading
+import time
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.core.password_hashing import (
+    PasswordHashPool,
+    PasswordHashPoolSaturated,
+    hash_password_now,
+    verify_password_now,
+)
+
+
+@pytest.fixture
+def busy_pool():
+    """One-process pool with no queue, kept busy for half a second."""
+    pool = PasswordHashPool(workers=1, queue_depth=0)
+    pool.start()
+    pool.running = pool.submit(time.sleep, 0.5)
+    yield pool
+    pool.running.result()
+    pool.shutdown()
+
+
+def test_hash_uses_configured_argon2_costs():
+    """New hashes carry the ARGON2_* costs from settings."""
+    hashed = hash_password_now("secret123")
+    assert hashed.startswith("$argon2id$")
+    assert (
+        f"m={settings.ARGON2_MEMORY_COST},t={settings.ARGON2_TIME_COST},"
+        f"p={settings.ARGON2_PARALLELISM}"
+    ) in hashed
+
+
+def test_pool_hashes_and_verifies_in_worker_process():
+    """Hashes made in the pool verify inline and vice versa."""
+    pool = PasswordHashPool(workers=1, queue_depth=1)
+    try:
+        hashed = pool.run(hash_password_now, "secret123")
+        assert verify_password_now("secret123", hashed)
+        assert pool.run(verify_password_now, "secret123", hashed)
+        assert not pool.run(verify_password_now, "wrong", hashed)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_calls_beyond_queue_depth(busy_pool):
+    """A full pool raises at once; the slot frees when the call ends."""
+    with pytest.raises(PasswordHashPoolSaturated):
+        busy_pool.submit(time.sleep, 0)
+    # Done callbacks run in order, so the pool's slot release comes first
+    released = threading.Event()
+    busy_pool.running.add_done_callback(lambda _: released.set())
+    assert released.wait(5)
+    busy_pool.submit(time.sleep, 0).result()
+
+
+def test_login_returns_503_with_retry_after_when_saturated(
+    client, busy_pool, monkeypatch
+):
+    """/token/ sheds load with 503 instead of queueing the hash."""
+    client.post(
+        "/register/",
+        json={"email": "me@example.com", "password": "secret123"},
+    )
+    monkeypatch.setattr(security, "password_pool", busy_pool)
+    response = client.post(
+        "/token/",
+        data={"username": "me@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(
+        settings.PASSWORD_HASH_RETRY_AFTER
+    )
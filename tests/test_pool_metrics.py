@@ -0,0 +1,48 @@
+"""Tests for DB connection pool metrics and the internal pool endpoint."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.pool_metrics import TimedQueuePool, instrument_pool
+
+
+def test_pool_metrics_record_usage_timeouts_and_lifetimes():
+    """Checkouts, peaks, timeouts, hold times and lifetimes are counted."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_logging_name="test-pool",
+    )
+    metrics = instrument_pool(engine, "test-pool")
+    first = engine.connect()
+    second = engine.connect()
+    assert metrics.stats()["in_use"] == 2
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+    engine.dispose()
+    stats = metrics.stats()
+    assert stats["peak_in_use"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["checkout_wait"]["count"] == 3
+    assert stats["checkout_wait"]["max_ms"] >= 50
+    assert stats["checkout_held"]["count"] == 2
+    assert stats["connection_lifetime"]["count"] == 2
+
+
+def test_internal_pool_endpoint_lists_primary_pool(client, monkeypatch):
+    """GET /internal/db/pool reports the primary pool to token holders."""
+    assert client.get("/internal/db/pool").status_code == 404
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "s3cret")
+    assert client.get("/internal/db/pool").status_code == 404
+    response = client.get(
+        "/internal/db/pool", headers={"X-Internal-Token": "s3cret"}
+    )
+    assert response.status_code == 200
+    assert "primary" in response.json()["pools"]
@@ -0,0 +1,84 @@
+"""Tests for the authenticated principal cache of protected routes."""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core import redis_client
+from app.core.config import settings
+from app.main import app
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+
+def _user_lookups(statements):
+    """Return the statements that read the users table."""
+    return [s for s in statements if "FROM users" in s]
+
+
+def test_order_routes_skip_user_lookup_after_login(
+    client, auth_headers, query_log
+):
+    """Login warms the cache, so order calls never select the user."""
+    query_log.clear()
+    response = client.get("/orders/user/1", headers=auth_headers)
+    assert response.status_code == 200
+    assert _user_lookups(query_log) == []
+
+
+def test_cache_miss_loads_user_once(client, auth_headers, query_log):
+    """After eviction the first call loads the user and re-caches it."""
+    redis_client._principal_l1.clear()
+    query_log.clear()
+    client.get("/orders/user/1", headers=auth_headers)
+    client.get("/orders/user/1", headers=auth_headers)
+    assert len(_user_lookups(query_log)) == 1
+    assert redis_client._principal_l1.peek(1) == {
+        "id": 1,
+        "email": "me@example.com",
+    }
+
+
+def test_deleting_user_evicts_principal_on_commit(client, auth_headers):
+    """A deleted user's token stops working at once."""
+    assert (
+        client.get("/orders/user/1", headers=auth_headers).status_code == 200
+    )
+    db = TestingSessionLocal()
+    db.delete(db.get(User, 1))
+    db.flush()
+    assert redis_client._principal_l1.peek(1) is not None
+    db.commit()
+    db.close()
+    assert redis_client._principal_l1.peek(1) is None
+    response = client.get("/orders/user/1", headers=auth_headers)
+    assert response.status_code == 401
+
+
+def test_rolled_back_delete_keeps_principal(client, auth_headers):
+    """A delete that is rolled back evicts nothing."""
+    db = TestingSessionLocal()
+    db.delete(db.get(User, 1))
+    db.flush()
+    db.rollback()
+    # A later commit on the same session must not evict it either
+    db.commit()
+    db.close()
+    assert redis_client._principal_l1.peek(1) is not None
+
+
+def test_listener_runs_for_principal_l1_without_order_l1(monkeypatch):
+    """Principal invalidations are received even with the order L1 off."""
+    monkeypatch.setattr(settings, "ORDER_L1_CACHE_SIZE", 0)
+    assert redis_client.l1_invalidation_channels() == [
+        redis_client.PRINCIPAL_INVALIDATION_CHANNEL
+    ]
+    with patch("app.main.OrderInvalidationListener") as listener:
+        with TestClient(app):
+            pass
+    listener.assert_called_once_with(
+        [redis_client.PRINCIPAL_INVALIDATION_CHANNEL]
+    )
+    listener.return_value.start.assert_called_once()
+    monkeypatch.setattr(settings, "PRINCIPAL_L1_CACHE_SIZE", 0)
+    assert redis_client.l1_invalidation_channels() == []
@@ -0,0 +1,64 @@
+"""Tests for per-request SQL metrics (Server-Timing, slow and N+1 logs)."""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.query_metrics import collect_queries, instrument_queries
+from tests.conftest import engine
+
+
+@pytest.fixture(autouse=True)
+def instrumented(monkeypatch):
+    """Instrument the test engine like the app's engines, metrics on."""
+    instrument_queries(engine)
+    monkeypatch.setattr(settings, "SQL_METRICS_ENABLED", True)
+
+
+def test_server_timing_reports_request_queries(client, auth_headers):
+    """Responses carry the request's query count and DB time."""
+    response = client.get("/users/me/", headers=auth_headers)
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "db-slowest;dur=" in timing
+
+
+def test_no_server_timing_when_metrics_disabled(
+    client, auth_headers, monkeypatch
+):
+    """With SQL_METRICS_ENABLED off, no DB timings reach the client."""
+    monkeypatch.setattr(settings, "SQL_METRICS_ENABLED", False)
+    response = client.get("/users/me/", headers=auth_headers)
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_slow_request_is_logged(client, auth_headers, monkeypatch, caplog):
+    """Requests over the query count threshold are logged."""
+    monkeypatch.setattr(settings, "SQL_SLOW_REQUEST_QUERIES", 1)
+    with caplog.at_level(logging.WARNING, "app.core.query_metrics"):
+        client.get("/users/me/", headers=auth_headers)
+    assert "Slow request GET /users/me/: 1 queries" in caplog.text
+    assert "FROM users" in caplog.text
+
+
+def test_repeated_statements_are_n_plus_one_suspects():
+    """Statements run threshold times in one request are reported."""
+    with engine.connect() as conn, collect_queries(True) as queries:
+        for i in range(3):
+            conn.execute(text("SELECT :i"), {"i": i})
+        conn.execute(text("SELECT 1"))
+    assert queries.count == 4
+    assert queries.repeated(3) == [("SELECT ?", 3)]
+
+
+def test_no_metrics_outside_a_request():
+    """Statements outside collect_queries are not recorded anywhere."""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with collect_queries() as queries:
+        pass
+    assert queries.count == 0
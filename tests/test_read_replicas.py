@@ -0,0 +1,128 @@
+"""Tests for read replica routing and read-your-writes stickiness."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import database
+from app.core.database import (
+    ReadSession,
+    ReplicaSet,
+    get_read_db,
+    pin_to_primary,
+)
+from app.main import app
+from tests.conftest import engine as test_engine
+
+
+def _broken_engine():
+    """Return an engine whose connections always fail."""
+    return create_engine("sqlite:////nonexistent-dir/replica.db")
+
+
+def test_replica_set_round_robin():
+    """Healthy replicas are picked in turn."""
+    first, second = create_engine("sqlite://"), create_engine("sqlite://")
+    replicas = ReplicaSet([first, second], retry_after=30)
+    assert [replicas.pick() for _ in range(4)] == [
+        first,
+        second,
+        first,
+        second,
+    ]
+
+
+def test_replica_set_skips_failed_replica_until_retry():
+    """
+    Picking never probes; a replica whose real query fails to connect is
+    skipped afterwards. None left -> None.
+    """
+    healthy, broken = create_engine("sqlite://"), _broken_engine()
+    replicas = ReplicaSet([broken, healthy], retry_after=30)
+    with patch.object(broken, "connect", wraps=broken.connect) as connect:
+        assert replicas.pick() == broken
+        connect.assert_not_called()
+        with pytest.raises(OperationalError):
+            with broken.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        assert [replicas.pick() for _ in range(3)] == [healthy] * 3
+    replicas.mark_down(1)
+    assert replicas.pick() is None
+
+
+def test_replica_dropped_mid_session_is_marked_down():
+    """A disconnect on a replica's query marks it down for later picks."""
+    replica = create_engine("sqlite://")
+    replicas = ReplicaSet([replica], retry_after=30)
+    with replica.connect() as conn:
+        with patch.object(replica.dialect, "is_disconnect", return_value=True):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+    assert replicas.pick() is None
+
+
+def test_read_session_binds_replica_primary_when_pinned_or_down():
+    """A read session uses a replica unless pinned or none is up."""
+    replica = create_engine("sqlite://")
+    replicas = ReplicaSet([replica], retry_after=30)
+    assert ReadSession(replicas).get_bind() is replica
+    pinned = ReadSession(replicas)
+    pin_to_primary(pinned)
+    assert pinned.get_bind() is database.engine
+    replicas.mark_down(0)
+    assert ReadSession(replicas).get_bind() is database.engine
+
+
+def test_read_session_falls_back_to_primary_on_connect_failure():
+    """A replica that fails to connect is marked down; the query runs."""
+    primary, broken = create_engine("sqlite://"), _broken_engine()
+    replicas = ReplicaSet([broken], retry_after=30)
+    with patch.object(database, "engine", primary):
+        db = ReadSession(replicas)
+        assert db.execute(text("SELECT 1")).scalar() == 1
+        assert db.get_bind() is primary
+        db.close()
+    assert replicas.pick() is None
+
+
+def test_get_order_served_by_primary_when_replica_unreachable(
+    client, auth_headers, monkeypatch
+):
+    """An unreachable replica does not fail the read request."""
+    r = client.post(
+        "/orders/",
+        headers=auth_headers,
+        json={"items": [], "total_price": 1.0},
+    )
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(
+        database, "replicas", ReplicaSet([_broken_engine()], retry_after=30)
+    )
+    # Use the real get_read_db, routing through the replica set
+    del app.dependency_overrides[get_read_db]
+    response = client.get(f"/orders/{r.json()['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == r.json()["id"]
+    assert database.replicas.pick() is None
+
+
+def test_order_writes_mark_user_for_read_your_writes(client, auth_headers):
+    """Creating and updating an order pins the user's reads to primary."""
+    with patch("app.services.order_service.mark_recent_write") as mock_mark:
+        r = client.post(
+            "/orders/",
+            headers=auth_headers,
+            json={"items": [], "total_price": 1.0},
+        )
+        client.patch(
+            f"/orders/{r.json()['id']}",
+            headers=auth_headers,
+            json={"status": "PAID"},
+        )
+    user_id = r.json()["user_id"]
+    assert [c.args for c in mock_mark.call_args_list] == [
+        (user_id,),
+        (user_id,),
+    ]
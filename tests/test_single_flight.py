@@ -0,0 +1,161 @@
+"""Tests for single-flight coalescing and early refresh of order loads."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from app.core.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    should_refresh_early,
+)
+from app.services.order_service import _load_order
+
+
+def test_single_flight_runs_function_once_for_concurrent_callers():
+    """Concurrent callers for one key share a single execution."""
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(timeout=2)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("k", load)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(timeout=2)
+    assert calls == [1]
+    assert results == ["value"] * 5
+
+
+def test_single_flight_propagates_errors_and_resets():
+    """A failing call raises for the caller and does not stick to the key."""
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("db down")
+
+    try:
+        flight.do("k", boom)
+    except RuntimeError:
+        pass
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_should_refresh_early_disabled_and_near_expiry():
+    """beta 0 never refreshes; a TTL of zero always does."""
+    assert should_refresh_early(ttl=0.0, delta=1.0, beta=0) is False
+    assert should_refresh_early(ttl=0.0, delta=1.0, beta=1.0) is True
+    assert should_refresh_early(ttl=1e9, delta=0.001, beta=1.0) is False
+
+
+_FILLED = {
+    "id": "o1",
+    "user_id": 1,
+    "total_price": 1.0,
+    "status": "PENDING",
+    "created_at": "2026-01-01T00:00:00",
+    "version": 1,
+}
+
+
+def _load_while_locked(polls, with_items=False):
+    """
+    Run _load_order while another worker holds the fill lock, with
+    cache_order_poll_fill answering polls; return (result, query_and_fill).
+    """
+    db = MagicMock()
+    with (
+        patch(
+            "app.services.order_service.acquire_order_fill_lock",
+            return_value=None,
+        ),
+        patch(
+            "app.services.order_service.cache_order_poll_fill",
+            side_effect=polls,
+        ),
+        patch(
+            "app.services.order_service._query_and_fill",
+            return_value="from db",
+        ) as query_and_fill,
+        patch("app.services.order_service.settings") as settings,
+    ):
+        settings.ORDER_FILL_LOCK_TTL = 5.0
+        settings.ORDER_FILL_POLL_INTERVAL = 0.001
+        return _load_order(db, "o1", with_items=with_items), query_and_fill
+
+
+def test_load_order_waits_for_other_worker_instead_of_querying():
+    """When another worker holds the fill lock, the cache is polled."""
+    result, query = _load_while_locked(
+        [(None, False, True), (_FILLED, False, True)]
+    )
+    assert result == _FILLED
+    query.assert_not_called()
+
+
+def test_load_order_stops_waiting_when_order_is_marked_missing():
+    """The holder's negative marker ends the wait with a miss, no query."""
+    result, query = _load_while_locked([(None, True, False)])
+    assert result is None
+    query.assert_not_called()
+
+
+def test_load_order_queries_once_lock_is_released_unfilled():
+    """A holder that failed or filled another projection ends the wait."""
+    result, query = _load_while_locked(
+        [(None, False, True), (_FILLED, False, False)], with_items=True
+    )
+    assert result == "from db"
+    query.assert_called_once()
+
+
+def test_async_single_flight_awaits_function_once():
+    """Concurrent coroutines for one key share a single execution."""
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_async_single_flight_waiter_takes_over_cancelled_leader():
+    """A cancelled leader does not cancel waiters; one of them reruns fn."""
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        leader = asyncio.create_task(flight.do("k", load))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do("k", load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        return leader.cancelled(), results
+
+    assert asyncio.run(main()) == (True, ["value"] * 3)
+    assert len(calls) == 2
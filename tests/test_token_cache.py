@@ -0,0 +1,69 @@
+"""Tests for the verified JWT cache in decode_access_token."""
+
+import hashlib
+import time
+
+import jwt
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty cache and zeroed counters."""
+    security._token_cache.clear()
+    security._token_cache.counter.hits = 0
+    security._token_cache.counter.misses = 0
+    yield
+    security._token_cache.clear()
+
+
+def _token(exp: float, sub: str = "1") -> str:
+    """Return a token signed with the app key expiring at exp."""
+    return jwt.encode(
+        {"sub": sub, "exp": int(exp)},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+
+def test_repeated_decode_is_served_from_cache():
+    """The second decode of a token is a cache hit with the same claims."""
+    token = create_access_token(7)
+    first = decode_access_token(token)
+    assert decode_access_token(token) == first
+    assert first["sub"] == "7"
+    stats = security.token_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_invalid_and_expired_tokens_are_not_cached():
+    """Only tokens that verify are cached."""
+    assert decode_access_token("invalid.jwt.here") is None
+    assert decode_access_token(_token(time.time() - 10)) is None
+    forged = _token(time.time() + 60)[:-2] + "xx"
+    assert decode_access_token(forged) is None
+    assert security.token_cache_stats()["size"] == 0
+
+
+def test_cached_token_is_not_served_after_exp():
+    """An entry is dropped once its token expired, even if its TTL has not."""
+    exp = time.time() - 1
+    token = _token(exp)
+    # As if cached before a wall clock jump past exp
+    key = hashlib.sha256(token.encode()).digest()
+    security._token_cache.set(key, {"sub": "1", "exp": int(exp)}, ttl=60)
+    assert decode_access_token(token) is None
+    assert security.token_cache_stats()["size"] == 0
+
+
+def test_entry_ttl_ends_at_token_exp():
+    """The cache entry itself disappears when the token expires."""
+    token = _token(time.time() + 1)
+    assert decode_access_token(token) is not None
+    time.sleep(1.1)
+    assert decode_access_token(token) is None
+    assert security.token_cache_stats()["hits"] == 0